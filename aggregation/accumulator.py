@@ -4,6 +4,8 @@ Not used in PDF-only V1 deployment.
 Safe to ignore.
 """
 
+from core.records import StudentResult, SubjectResult
+
 
 class ResultAccumulator:
     def __init__(self):
@@ -25,15 +27,7 @@ class ResultAccumulator:
         {
             "usn": "4DM23AI039",
             "name": "MUHAMMAD THASHREEF",
-            "subjects": [
-                {
-                    "subject_code": "BCS401",
-                    "internal": 40,
-                    "external": 25,
-                    "total": 65,
-                    "result": "P"
-                }
-            ]
+            "subjects": [SubjectResult("BCS401", 40, 25, 65, "P")]
         }
         """
 
@@ -45,11 +39,11 @@ class ResultAccumulator:
             if self.current_result:
                 self._finalize_current()
 
-            self.current_result = {
-                "usn": extracted_data["usn"],
-                "name": extracted_data.get("name"),
-                "subjects": subjects.copy()
-            }
+            self.current_result = StudentResult(
+                usn=extracted_data["usn"],
+                name=extracted_data.get("name"),
+                subjects=list(subjects)
+            )
 
         # 🔹 Continuation page
         else:
@@ -57,7 +51,7 @@ class ResultAccumulator:
                 # Orphan continuation page — ignore
                 return
 
-            self.current_result["subjects"].extend(subjects)
+            self.current_result.subjects.extend(subjects)
 
     def finalize(self):
         """Call once after all pages are processed"""
@@ -75,23 +69,23 @@ class ResultAccumulator:
         seen = set()
         unique_subjects = []
 
-        for s in self.current_result["subjects"]:
-            key = s.get("subject_code")
+        for s in self.current_result.subjects:
+            key = s.subject_code
             if not key or key in seen:
                 continue
             seen.add(key)
             unique_subjects.append(s)
 
-        self.current_result["subjects"] = unique_subjects
+        self.current_result.subjects = unique_subjects
         self.final_results.append(self.current_result)
         self.current_result = None
 
     def _extract_subjects(self, extracted_data: dict):
         """
-        Handles BOTH text-based and dict-based subjects.
+        Handles BOTH text-based and record-based subjects.
         """
 
-        # ✅ OCR path (dict-based)
+        # ✅ OCR path (SubjectResult records)
         if "subjects" in extracted_data and isinstance(extracted_data["subjects"], list):
             return extracted_data["subjects"]
 
@@ -110,12 +104,12 @@ class ResultAccumulator:
             if len(parts) < 5:
                 continue
 
-            subjects.append({
-                "subject_code": parts[0],
-                "internal": int(parts[1]),
-                "external": int(parts[2]),
-                "total": int(parts[3]),
-                "result": parts[4]
-            })
+            subjects.append(SubjectResult(
+                subject_code=parts[0],
+                internal=int(parts[1]),
+                external=int(parts[2]),
+                total=int(parts[3]),
+                result=parts[4]
+            ))
 
         return subjects
@@ -4,6 +4,8 @@ Not used in PDF-only V1 deployment.
 Safe to ignore.
 """
 
+from core.records import StudentResult
+
 
 def dedupe_subjects(subjects):
     """
@@ -12,7 +14,7 @@ def dedupe_subjects(subjects):
     """
     seen = {}
     for s in subjects:
-        code = s.get("code")
+        code = s.subject_code
         if code:
             seen[code] = s
     return list(seen.values())
@@ -37,10 +39,10 @@ def merge_page_results(page_results):
 
         # New document starts when header + USN is present
         if header and header.get("usn"):
-            current_doc = {
-                "header": header,
-                "subjects": []
-            }
+            current_doc = StudentResult(
+                usn=header["usn"],
+                name=header.get("name")
+            )
             merged_results.append(current_doc)
 
         # Safety: orphan continuation page
@@ -48,10 +50,10 @@ def merge_page_results(page_results):
             continue
 
         # Append subjects
-        current_doc["subjects"].extend(subjects)
+        current_doc.subjects.extend(subjects)
 
     # De-duplicate subjects in each merged doc
     for doc in merged_results:
-        doc["subjects"] = dedupe_subjects(doc["subjects"])
+        doc.subjects = dedupe_subjects(doc.subjects)
 
     return merged_results
@@ -1,17 +1,23 @@
 from flask import Flask, request, jsonify, send_file
 from pathlib import Path
 from flask_cors import CORS
-import shutil
-import uuid
 import os
 import traceback
+from werkzeug.utils import secure_filename
 
-from batch.run_batch import run_pdf_batch
+from api.uploads import SpooledRequest
+from batch.controller import get_pdf_cache
+from batch.run_batch import run_pdf_stream_batch
+from batch.jobs import JobStore, DONE
+from core.config import JOB_RESULT_MAX_AGE, TEMP_MAX_AGE
+from ingestion.image.ocr_cache import get_ocr_cache
+from utils.janitor import TempJanitor
 
 # --------------------
 # App setup
 # --------------------
 app = Flask(__name__)
+app.request_class = SpooledRequest
 
 # 🔒 Strong CORS (works even on errors)
 CORS(
@@ -27,6 +33,10 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 TEMP_ROOT = Path(BASE_DIR) / "temp"
 TEMP_ROOT.mkdir(exist_ok=True)
 
+# Large uploads spill here; the janitor sweeps anything left behind
+SpooledRequest.spool_dir = str(TEMP_ROOT)
+janitor = TempJanitor(TEMP_ROOT, max_age=TEMP_MAX_AGE)
+
 TEMPLATE_MAP = {
     "3": "3rd Sem.xlsx",
     "4": "4th Sem.xlsx",
@@ -34,48 +44,90 @@ TEMPLATE_MAP = {
     "7": "7th Sem.xlsx",
 }
 
+# Background jobs (see batch/worker.py)
+job_store = JobStore()
+
+
+def validate_upload(files, semester):
+    """
+    Returns (template_path, None) on success,
+    or (None, error_response) when the request is invalid.
+    """
+    if not files:
+        return None, (jsonify({"error": "No files uploaded"}), 400)
+
+    if not semester:
+        return None, (jsonify({"error": "Semester not selected"}), 400)
+
+    # PDFs, or ZIPs of PDFs / result photos (V1)
+    for f in files:
+        if not f.filename.lower().endswith((".pdf", ".zip")):
+            return None, (jsonify({
+                "error": "Only PDF or ZIP files are supported in V1"
+            }), 400)
+
+    template_name = TEMPLATE_MAP.get(semester)
+    if not template_name:
+        return None, (jsonify({"error": "Invalid semester selected"}), 400)
+
+    template_path = os.path.join(TEMPLATES_DIR, template_name)
+    if not os.path.exists(template_path):
+        return None, (jsonify({"error": "Template file not found"}), 500)
+
+    return template_path, None
+
+
+def safe_upload_names(files) -> list[str] | None:
+    """
+    Filesystem-safe names for uploads stored on disk (no paths,
+    no "../"), made unique so two files never overwrite each other.
+    None if a name has nothing safe left in it.
+    """
+    names = []
+    taken = set()
+
+    for f in files:
+        name = secure_filename(f.filename or "")
+        if not name:
+            return None
+
+        stem, suffix = os.path.splitext(name)
+        n = 1
+        while name.lower() in taken:
+            name = f"{stem}_{n}{suffix}"
+            n += 1
+
+        taken.add(name.lower())
+        names.append(name)
+
+    return names
+
+
 # --------------------
 # Routes
 # --------------------
 @app.route("/upload", methods=["POST"])
 def upload():
-    session_dir = None
+    janitor.ensure_started()
 
     try:
         files = request.files.getlist("files")
         semester = request.form.get("semester")
 
-        if not files:
-            return jsonify({"error": "No files uploaded"}), 400
-
-        if not semester:
-            return jsonify({"error": "Semester not selected"}), 400
-
-        # PDF ONLY (V1)
-        for f in files:
-            if not f.filename.lower().endswith(".pdf"):
-                return jsonify({
-                    "error": "Only PDF files are supported in V1"
-                }), 400
-
-        template_name = TEMPLATE_MAP.get(semester)
-        if not template_name:
-            return jsonify({"error": "Invalid semester selected"}), 400
+        template_path, error = validate_upload(files, semester)
+        if error:
+            return error
 
-        template_path = os.path.join(TEMPLATES_DIR, template_name)
-        if not os.path.exists(template_path):
-            return jsonify({"error": "Template file not found"}), 500
+        # Same order as the old sorted session folder
+        files = sorted(files, key=lambda f: f.filename)
 
-        # Create session folder
-        session_dir = TEMP_ROOT / str(uuid.uuid4())
-        session_dir.mkdir(parents=True, exist_ok=True)
-
-        # Save PDFs
-        for file in files:
-            file.save(session_dir / file.filename)
-
-        # Run batch processor
-        output_excel = run_pdf_batch(session_dir, template_path)
+        # Parse uploads straight from their spooled streams;
+        # ZIPs are read in place, never extracted
+        output_excel = run_pdf_stream_batch(
+            [f.stream for f in files if not f.filename.lower().endswith(".zip")],
+            template_path,
+            [f.stream for f in files if f.filename.lower().endswith(".zip")]
+        )
 
         # ✅ Return file cleanly
         return send_file(
@@ -89,10 +141,95 @@ def upload():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
-    finally:
-        # Cleanup AFTER response is prepared
-        if session_dir and session_dir.exists():
-            shutil.rmtree(session_dir, ignore_errors=True)
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """
+    Async variant of /upload: stores the PDFs and returns a job id.
+    A worker process (python -m batch.worker) builds the workbook.
+    The workbook can be downloaded for JOB_RESULT_MAX_AGE seconds
+    (default 24 h) after the job finishes; then the job is deleted.
+    """
+    try:
+        files = request.files.getlist("files")
+        semester = request.form.get("semester")
+
+        template_path, error = validate_upload(files, semester)
+        if error:
+            return error
+
+        names = safe_upload_names(files)
+        if names is None:
+            return jsonify({"error": "Invalid file name"}), 400
+
+        job_id, input_dir = job_store.create()
+
+        try:
+            for file, name in zip(files, names):
+                file.save(input_dir / name)
+
+            job_store.submit(job_id, input_dir, template_path)
+        except Exception:
+            job_store.discard(job_id)
+            raise
+
+        return jsonify({"job_id": job_id, "status": "queued"}), 202
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    return jsonify({
+        "job_id": job["id"],
+        "status": job["status"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "expires_at": (
+            job["finished_at"] + JOB_RESULT_MAX_AGE if job["finished_at"] else None
+        ),
+    })
+
+
+@app.route("/jobs/<job_id>/result", methods=["GET"])
+def job_result(job_id):
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    if job["status"] != DONE:
+        return jsonify({
+            "error": "Result not ready",
+            "status": job["status"]
+        }), 409
+
+    return send_file(
+        job["output_path"],
+        as_attachment=True,
+        download_name="VTU_Result.xlsx"
+    )
+
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    cache = get_pdf_cache()
+    ocr_cache = get_ocr_cache()
+
+    stats = {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
+    stats["ocr"] = (
+        {"enabled": False} if ocr_cache is None
+        else {"enabled": True, **ocr_cache.stats()}
+    )
+
+    return jsonify(stats)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+from tempfile import SpooledTemporaryFile
+
+from flask import Request
+
+from core.config import SPOOL_MAX_MEMORY
+
+
+class SpooledRequest(Request):
+    """
+    Keeps each uploaded file in memory up to SPOOL_MAX_MEMORY bytes,
+    spilling larger ones to an anonymous temp file under spool_dir.
+
+    The PDF pipeline reads FileStorage.stream directly, so uploads are
+    never saved to a session folder and read back.
+    """
+
+    spool_dir = None
+
+    def _get_file_stream(
+        self,
+        total_content_length,
+        content_type,
+        filename=None,
+        content_length=None,
+    ):
+        return SpooledTemporaryFile(
+            max_size=SPOOL_MAX_MEMORY,
+            mode="rb+",
+            dir=self.spool_dir
+        )
@@ -1,30 +1,175 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from services.vtu_pdf_parser import parse_vtu_pdf
-from services.vtu_ocr_parser import parse_vtu_image
+from core.config import (
+    PDF_WORKERS,
+    PARALLEL_MIN_FILES,
+    PDF_CACHE_PATH,
+    PDF_CACHE_MAX_BYTES,
+)
+from core.records import StudentResult
+from batch.image_controller import folder_student, image_student_results
+from ingestion.manifest import build_manifest, top_level
+from services.result_cache import ResultCache, hash_key
+from services.vtu_pdf_parser import parse_vtu_pdf, PARSER_VERSION
 
 TARGET_USN = "4DM23AI039"
 
-# NOTE: In V1 deployment, this is used in PDF-only mode.
+# NOTE: image folders in the input (batch CLI, /jobs) are OCR'd live.
 
+_pdf_cache = None
 
-def collect_batch_results(input_path: str) -> list[dict]:
+
+def get_pdf_cache() -> ResultCache | None:
+    global _pdf_cache
+    if _pdf_cache is None and PDF_CACHE_MAX_BYTES > 0:
+        _pdf_cache = ResultCache(PDF_CACHE_PATH, PDF_CACHE_MAX_BYTES)
+    return _pdf_cache
+
+
+def read_pdf_bytes(pdf) -> bytes:
+    if isinstance(pdf, bytes):
+        return pdf
+    if isinstance(pdf, (str, Path)):
+        return Path(pdf).read_bytes()
+    return pdf.read()
+
+
+def iter_pdf_results(
+    pdf_paths: list,
+    workers: int | None = None,
+    hashes: list[str] | None = None
+):
+    """
+    Yields parse_vtu_pdf results in the same order as pdf_paths.
+
+    Entries may be paths or open binary streams. Files already parsed
+    (same bytes, same PARSER_VERSION) come from the result cache;
+    only the rest are parsed.
+
+    hashes: sha256 of each entry when already known (input manifest);
+    cached files are then never read at all.
+    """
+    cache = get_pdf_cache()
+    if cache is None:
+        yield from parse_pdfs(pdf_paths, workers)
+        return
+
+    if hashes is None:
+        pdf_data = [read_pdf_bytes(p) for p in pdf_paths]
+        hashes = [hashlib.sha256(data).hexdigest() for data in pdf_data]
+    else:
+        pdf_data = pdf_paths
+
+    keys = [hash_key(sha256, f"pdf-v{PARSER_VERSION}") for sha256 in hashes]
+
+    results = {
+        key: StudentResult.from_json(value)
+        for key, value in cache.get_many(keys).items()
+    }
+
+    # Same file uploaded twice in one batch is parsed once
+    missing = {}
+    for key, data in zip(keys, pdf_data):
+        if key not in results:
+            missing.setdefault(key, data)
+
+    parsed = dict(zip(missing, parse_pdfs(list(missing.values()), workers)))
+    cache.put_many({key: result.to_json() for key, result in parsed.items()})
+    results.update(parsed)
+
+    for key in keys:
+        yield results[key]
+
+
+def parse_pdfs(pdf_paths: list, workers: int | None = None):
+    """
+    Yields parse_vtu_pdf results in input order.
+
+    Small batches run serially: spinning up the pool costs
+    more than it saves for a handful of files.
+    """
+    workers = PDF_WORKERS if workers is None else workers
+
+    if workers <= 1 or len(pdf_paths) < PARALLEL_MIN_FILES:
+        for path in pdf_paths:
+            yield parse_vtu_pdf(path)
+        return
+
+    # Streams can't cross the process boundary, their bytes can
+    pdf_paths = [
+        p if isinstance(p, str) else read_pdf_bytes(p)
+        for p in pdf_paths
+    ]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pdf_paths))) as pool:
+        # map() keeps input order
+        yield from pool.map(parse_vtu_pdf, pdf_paths)
+
+
+def collect_batch_results(
+    input_path: str,
+    workers: int | None = None,
+    manifest: list | None = None
+) -> list[StudentResult]:
+    """
+    Files are routed by their content type (input manifest), not by
+    extension. Pass the manifest from identify_input() to skip the walk.
+
+    Image folders go through the live OCR pipeline. Their subjects may
+    come back without marks; the writer leaves those cells blank.
+    """
     results = []
-    base = Path(input_path)
+    if manifest is None:
+        manifest = build_manifest([input_path])
+    items = top_level(manifest)
+
+    pdfs = [
+        entry for _, entry in items
+        if not isinstance(entry, list) and entry.kind == "pdf"
+    ]
+    pdf_results = iter_pdf_results(
+        [entry.path for entry in pdfs],
+        workers,
+        hashes=[entry.sha256 for entry in pdfs]
+    )
 
-    for item in sorted(base.iterdir()):
-        if item.is_file() and item.suffix.lower() == ".pdf":
-            print(f"Processing PDF: {item.name}")
-            result = parse_vtu_pdf(str(item))
+    # Image folders are OCR'd together after the walk (one pipelined
+    # pass); their results go back into these slots, in folder order
+    image_students = []
+    image_slots = []
+
+    for name, entry in items:
+        if isinstance(entry, list):
+            print(f"Processing images: {name}")
+            student = folder_student(name, entry)
+            if student:
+                image_students.append(student)
+                image_slots.append(len(results))
+                results.append(None)
+
+        elif entry.kind == "pdf":
+            print(f"Processing PDF: {name}")
+            result = next(pdf_results)
             results.append(result)
 
-        elif item.is_dir():
-            print(f"Processing images: {item.name}")
-            images = sorted(
-                str(p) for p in item.iterdir()
-                if p.suffix.lower() in [".jpg", ".png", ".jpeg"]
-            )
-            if images:
-                result = parse_vtu_image(images)
-                results.append(result)
-
-    return results
+        elif entry.kind == "zip":
+            print(f"Processing ZIP: {name}")
+            from batch.zip_controller import collect_zip_results
+
+            results.extend(collect_zip_results(entry.path, workers))
+
+    if image_students:
+        # A failed folder is logged and skipped, like in image batches
+        for slot, result in zip(image_slots, image_student_results(image_students)):
+            results[slot] = result
+
+    return [result for result in results if result]
+
+
+def collect_stream_results(pdf_streams: list, workers: int | None = None) -> list[StudentResult]:
+    """
+    Same as collect_batch_results for PDFs already held in memory
+    (or spooled temp files), e.g. straight from an upload.
+    """
+    return list(iter_pdf_results(pdf_streams, workers))
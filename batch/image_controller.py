@@ -1,8 +1,8 @@
-from pathlib import Path
 import re
-from services.vtu_ocr_parser import parse_vtu_image
-
-IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+from core.records import StudentResult
+from ingestion.input_identifier import type_from_name
+from ingestion.manifest import build_manifest, top_level
+from batch.image_pipeline import run_image_pipeline
 
 
 import re
@@ -40,75 +40,96 @@ def normalize_ai_usn(usn: str | None) -> str | None:
     return cleaned
 
 
-def collect_image_batch_results(image_root: str) -> list[dict]:
+def collect_image_batch_results(image_root: str, manifest: list | None = None) -> list[StudentResult]:
     """
     V1 Image batch rules:
     - Single image file = single student
     - Folder of images = multi-page student
+
+    Images are recognized by content (input manifest), and their
+    manifest hashes key the OCR cache. Pass the manifest from
+    identify_input() to skip the walk.
+
+    Pages of all students go through one staged pipeline (enhance ->
+    OCR in fixed-size batches -> parse), then come back per student
+    in folder order.
     """
 
-    results = []
-    base = Path(image_root)
+    if manifest is None:
+        manifest = build_manifest([image_root])
+
+    # (label, kind, [manifest entries]) per student, in folder order
+    students = []
+
+    for name, entry in top_level(manifest):
 
-    for item in sorted(base.iterdir()):
+        # 📂 CASE 2: Folder = multi-page student
+        if isinstance(entry, list):
+            student = folder_student(name, entry)
+            if student:
+                students.append(student)
 
         # 🖼️ CASE 1: Single image = single-page student
-        if item.is_file() and item.suffix.lower() in IMAGE_EXTS:
-            try:
-                raw = parse_vtu_image([str(item)])
+        elif entry.kind == "image":
+            students.append((name, "image", [entry]))
 
-                normalized_usn = normalize_ai_usn(raw.get("usn"))
-                if not normalized_usn:
-                    print(f"⚠️ Skipping image (no USN): {item.name}")
-                    continue
+        # Ignore everything else
 
-                result = {
-                    "header": {
-                        "usn": normalized_usn,
-                        "name": raw.get("name"),
-                    },
-                    "subjects": raw.get("subjects", [])
-                }
+    return run_image_students(students)
 
-                results.append(result)
 
-            except Exception as e:
-                print(f"❌ Failed {item.name}: {e}")
+def folder_student(name: str, entries: list) -> tuple | None:
+    """
+    (name, "folder", [image entries]) for a folder of manifest entries,
+    or None if it holds no images. A page that isn't a readable image
+    fails the whole student, caught here before any OCR work.
+    """
+    broken = [e for e in entries if e.kind is None and type_from_name(e.path) == "image"]
+    if broken:
+        print(f"❌ Failed folder {name}: {broken[0].parts[-1]} is not a valid image")
+        return None
 
-        # 📂 CASE 2: Folder = multi-page student
-        elif item.is_dir():
-            images = sorted(
-                str(p)
-                for p in item.iterdir()
-                if p.suffix.lower() in IMAGE_EXTS
-            )
-
-            if not images:
-                continue
+    images = [e for e in entries if e.kind == "image"]
+    return (name, "folder", images) if images else None
 
-            try:
-                raw = parse_vtu_image(images)
 
-                normalized_usn = normalize_ai_usn(raw.get("usn"))
-                if not normalized_usn:
-                    print(f"⚠️ Skipping folder (no USN): {item.name}")
-                    continue
+def image_student_results(students: list[tuple]) -> list[StudentResult | None]:
+    """
+    students: (label, "image" | "folder", [pages]) per student, where
+    pages are anything run_image_pipeline() accepts (paths, bytes, ...).
+    Returns one entry per student, in the same order: the StudentResult,
+    or None if the student failed or has no USN (logged, not raised).
+    """
+    # 🔍 One pipelined OCR pass over every page
+    outcomes = run_image_pipeline([images for _, _, images in students])
 
-                result = {
-                    "header": {
-                        "usn": normalized_usn,
-                        "name": raw.get("name"),
-                    },
-                    "subjects": raw.get("subjects", [])
-                }
+    results = []
 
-                results.append(result)
+    for (label, kind, _), raw in zip(students, outcomes):
+        try:
+            if isinstance(raw, Exception):
+                raise raw
 
-            except Exception as e:
-                print(f"❌ Failed folder {item.name}: {e}")
+            normalized_usn = normalize_ai_usn(raw.usn if raw else None)
+            if not normalized_usn:
+                print(f"⚠️ Skipping {kind} (no USN): {label}")
+                results.append(None)
+                continue
 
-        # Ignore everything else
-        else:
-            continue
+            raw.usn = normalized_usn
+            results.append(raw)
+
+        except Exception as e:
+            failed = "Failed" if kind == "image" else "Failed folder"
+            print(f"❌ {failed} {label}: {e}")
+            results.append(None)
 
     return results
+
+
+def run_image_students(students: list[tuple]) -> list[StudentResult]:
+    """
+    Same as image_student_results(), keeping only the students
+    that produced a result.
+    """
+    return [result for result in image_student_results(students) if result]
@@ -0,0 +1,214 @@
+"""
+Staged OCR pipeline for image batches:
+
+    decode + enhance      ->   OCR inference      ->   parse + accumulate
+    (process pool)             (calling thread,        (thread)
+                                batched)
+
+Stages are joined by bounded queues (at most OCR_PIPELINE_DEPTH pages
+in flight each), so a fast stage waits instead of piling up images in
+memory. Pages move through every stage in input order, so results come
+back in the same order as the students that were passed in.
+
+A page that fails in any stage (unreadable member, enhancer error,
+OCR error) fails only the student it belongs to.
+
+With OCR_CASCADE on, workers prebuild only the first cascade variant.
+Pages that need later rounds build those variants lazily on the OCR
+thread, so for them enhancement and inference do not overlap.
+"""
+
+import multiprocessing
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core.config import (
+    OCR_BATCH_SIZE,
+    OCR_CASCADE,
+    OCR_ENHANCE_WORKERS,
+    OCR_PIPELINE_DEPTH,
+)
+from ingestion.manifest import ManifestEntry
+
+_DONE = object()
+
+
+def _is_page(item) -> bool:
+    # Enhanced variants, as opposed to None (unreadable) or an Exception
+    return item is not None and not isinstance(item, Exception)
+
+
+def enhance_page(
+    image_path: str | bytes,
+    prefetch: tuple = (),
+    source_hash: str | None = None
+):
+    """
+    Stage 1 (runs in a worker process): load the photo and build the
+    variants the OCR stage will most likely ask for first. Any other
+    variant is still built lazily, on demand, on the OCR thread.
+    Returns None if the image can't be loaded.
+    """
+    from ingestion.image.enhancer import ImageEnhancer
+
+    try:
+        variants = ImageEnhancer(debug=False).process_image(image_path, source_hash)
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return None
+
+    for name in prefetch:
+        variants[name]
+
+    return variants
+
+
+def load_page(page) -> tuple[str | bytes, str | None]:
+    """
+    (path or file bytes, sha256 if known) for a page.
+
+    Pages are image paths, file bytes, input manifest entries (whose
+    hash is reused), or zero-argument callables returning file bytes
+    (e.g. a ZIP member read). Callables are only called when the page
+    enters the pipeline.
+    """
+    if isinstance(page, ManifestEntry):
+        return page.path, page.sha256
+    return (page() if callable(page) else page), None
+
+
+def iter_enhanced(image_paths: list, prefetch: tuple, workers: int, depth: int):
+    """
+    Yields enhance_page() results in input order, keeping at
+    most depth pages submitted to the pool at a time.
+    A page that raised (while loading or enhancing) yields the Exception.
+    """
+    if workers <= 1:
+        for path in image_paths:
+            try:
+                source, source_hash = load_page(path)
+                yield enhance_page(source, source_hash=source_hash)
+            except Exception as e:
+                yield e
+        return
+
+    def result(item):
+        if isinstance(item, Exception):
+            return item
+        try:
+            return item.result()
+        except Exception as e:
+            return e
+
+    # spawn: the OCR stage may already have torch threads running,
+    # which fork() does not copy safely
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # futures, or the Exception of a page that failed before submit
+        pending = deque()
+        for path in image_paths:
+            try:
+                source, source_hash = load_page(path)
+                pending.append(pool.submit(enhance_page, source, prefetch, source_hash))
+            except Exception as e:
+                pending.append(e)
+
+            if len(pending) >= depth:
+                yield result(pending.popleft())
+
+        while pending:
+            yield result(pending.popleft())
+
+
+def run_image_pipeline(
+    students: list[list],
+    workers: int | None = None,
+    depth: int = OCR_PIPELINE_DEPTH,
+    batch_size: int = OCR_BATCH_SIZE,
+) -> list:
+    """
+    students holds each student's pages (see load_page), in page order.
+    Returns one entry per student, in the same order: a StudentResult,
+    None (no result parsed) or the Exception that stopped that student.
+    """
+    from ingestion.image.enhancer import VARIANT_NAMES
+    from ingestion.image.runner import get_variant_stats, run_best_ocr_variants
+    from services.vtu_ocr_parser import parse_ocr_pages
+
+    workers = OCR_ENHANCE_WORKERS if workers is None else workers
+
+    if OCR_CASCADE:
+        # First cascade round: the variant currently ranked first
+        prefetch = tuple(get_variant_stats().order(list(VARIANT_NAMES))[:1])
+    else:
+        prefetch = VARIANT_NAMES
+
+    outcomes = [None] * len(students)
+    texts = queue.Queue(maxsize=depth)
+
+    # ---------- Stage 3: parse + accumulate ----------
+    def parse_stage():
+        for index, images in enumerate(students):
+            ocr_texts = []
+            for _ in images:
+                text = texts.get()
+                if text is _DONE:
+                    return
+                ocr_texts.append(text)
+
+            try:
+                for text in ocr_texts:
+                    if isinstance(text, Exception):
+                        raise text
+                if any(text is None for text in ocr_texts):
+                    raise ValueError("Failed to load one or more images")
+                outcomes[index] = parse_ocr_pages(ocr_texts)
+            except Exception as e:
+                outcomes[index] = e
+
+    parser = threading.Thread(target=parse_stage, name="ocr-parse", daemon=True)
+    parser.start()
+
+    # ---------- Stage 2: batched OCR inference ----------
+    def ocr_pages(pages: list) -> list:
+        """
+        Best text per page. If the batch fails, its pages are retried
+        one by one so only the page that breaks gets the Exception.
+        """
+        try:
+            return run_best_ocr_variants(pages)
+        except Exception as e:
+            if len(pages) == 1:
+                return [e]
+        return [ocr_pages([page])[0] for page in pages]
+
+    def flush(batch):
+        loaded = [item for item in batch if _is_page(item)]
+        best = iter(ocr_pages(loaded))
+        for item in batch:
+            # None / Exception: the page never reached OCR
+            texts.put(next(best) if _is_page(item) else item)
+
+    try:
+        batch = []
+        loaded = 0
+        all_pages = [path for images in students for path in images]
+
+        for variants in iter_enhanced(all_pages, prefetch, workers, depth):
+            batch.append(variants)
+            loaded += _is_page(variants)
+            if loaded == batch_size:
+                flush(batch)
+                batch = []
+                loaded = 0
+
+        flush(batch)
+    finally:
+        # Unblocks the parser even if inference failed
+        texts.put(_DONE)
+        parser.join()
+
+    return outcomes
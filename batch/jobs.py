@@ -0,0 +1,183 @@
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+JOBS_ROOT = PROJECT_ROOT / "jobs"
+JOBS_DB = JOBS_ROOT / "jobs.db"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            TEXT PRIMARY KEY,
+    status        TEXT NOT NULL,
+    input_dir     TEXT NOT NULL,
+    template_path TEXT NOT NULL,
+    output_path   TEXT,
+    error         TEXT,
+    created_at    REAL NOT NULL,
+    started_at    REAL,
+    finished_at   REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class JobStore:
+    """
+    Durable job queue backed by a local SQLite file.
+
+    Safe to share between the web process and any number of
+    worker processes: every call opens its own connection and
+    claim() takes a write lock before picking a job.
+    """
+
+    def __init__(self, db_path: Path = JOBS_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def job_dir(self, job_id: str) -> Path:
+        return self.db_path.parent / job_id
+
+    # -----------------------
+    # Web side
+    # -----------------------
+
+    def create(self) -> tuple[str, Path]:
+        """
+        Reserves a job id and its working folder.
+        Files go into <job_dir>/input before submit() is called.
+        """
+        job_id = str(uuid.uuid4())
+        input_dir = self.job_dir(job_id) / "input"
+        input_dir.mkdir(parents=True, exist_ok=True)
+        return job_id, input_dir
+
+    def discard(self, job_id: str):
+        """
+        Removes the folder of a job that was created but never submitted
+        (e.g. the upload failed half way).
+        """
+        shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+    def submit(self, job_id: str, input_dir: Path, template_path: str):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, input_dir, template_path, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, str(input_dir), str(template_path), time.time())
+            )
+
+    def get(self, job_id: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    # -----------------------
+    # Worker side
+    # -----------------------
+
+    def claim(self) -> dict | None:
+        """
+        Atomically moves the oldest queued job to RUNNING.
+        Returns None when the queue is empty.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                        (RUNNING, time.time(), row["id"])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["status"] = RUNNING
+        return job
+
+    def complete(self, job_id: str, output_path: Path):
+        self._finish(job_id, DONE, output_path=str(output_path))
+        # Uploaded files are not needed once the workbook exists
+        shutil.rmtree(self.job_dir(job_id) / "input", ignore_errors=True)
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, FAILED, error=error)
+        # Nothing to download: the error is kept in the jobs table
+        shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+    def _finish(self, job_id, status, output_path=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, output_path = ?, error = ?, finished_at = ? "
+                "WHERE id = ?",
+                (status, output_path, error, time.time(), job_id)
+            )
+
+    def purge_finished(self, max_age: float) -> int:
+        """
+        Deletes DONE / FAILED jobs that finished more than max_age
+        seconds ago, with their folders (the workbook goes too).
+        Returns the number of jobs removed.
+        """
+        with self._connect() as conn:
+            ids = [
+                row["id"] for row in conn.execute(
+                    "SELECT id FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                    (DONE, FAILED, time.time() - max_age)
+                )
+            ]
+
+            # Folders first: a crash in between leaves a row, never an orphan folder
+            for job_id in ids:
+                shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in ids])
+
+        return len(ids)
+
+    def requeue_stale(self, max_age: float) -> int:
+        """
+        Puts RUNNING jobs older than max_age seconds back in the queue
+        (worker crashed or was killed mid-job).
+        """
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL "
+                "WHERE status = ? AND started_at < ?",
+                (QUEUED, RUNNING, time.time() - max_age)
+            )
+            return cur.rowcount
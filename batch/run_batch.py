@@ -1,28 +1,35 @@
+import io
 from pathlib import Path
 from datetime import datetime
 
-from batch.controller import collect_batch_results
+from batch.controller import collect_batch_results, collect_stream_results
+from batch.zip_controller import collect_zip_results
 from export.excel_batch import write_batch_results_excel
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
-def run_pdf_batch(input_dir: Path, template_path: Path) -> Path:
+def run_pdf_batch(
+    input_dir: Path,
+    template_path: Path,
+    output_excel: Path | None = None
+) -> Path:
     """
     Runs PDF batch pipeline and returns output Excel path.
     """
 
-    output_dir = PROJECT_ROOT / "output"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if output_excel is None:
+        output_dir = PROJECT_ROOT / "output"
+        output_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_excel = output_dir / f"batch_result_{timestamp}.xlsx"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_excel = output_dir / f"batch_result_{timestamp}.xlsx"
 
     results = collect_batch_results(str(input_dir))
 
     if not results:
         raise ValueError("No valid PDF results found")
 
-    results.sort(key=lambda r: r["header"].get("usn") or "ZZZZZZZZ")
+    results.sort(key=lambda r: r.usn or "ZZZZZZZZ")
 
     write_batch_results_excel(
         results=results,
@@ -32,3 +39,36 @@ def run_pdf_batch(input_dir: Path, template_path: Path) -> Path:
     )
 
     return output_excel
+
+
+def run_pdf_stream_batch(
+    pdf_streams: list,
+    template_path: Path,
+    zip_streams: list = ()
+) -> io.BytesIO:
+    """
+    Runs PDF batch pipeline on in-memory uploads (PDFs, plus any
+    ZIPs of PDFs / result photos) and returns the Excel workbook
+    as an in-memory file.
+    """
+
+    results = collect_stream_results(pdf_streams)
+
+    for zip_stream in zip_streams:
+        results.extend(collect_zip_results(zip_stream))
+
+    if not results:
+        raise ValueError("No valid PDF results found")
+
+    results.sort(key=lambda r: r.usn or "ZZZZZZZZ")
+
+    output_excel = io.BytesIO()
+    write_batch_results_excel(
+        results=results,
+        template_path=str(template_path),
+        output_path=output_excel,
+        start_row=6
+    )
+    output_excel.seek(0)
+
+    return output_excel
@@ -20,7 +20,7 @@ def run_image_batch(input_dir: Path) -> Path:
         raise ValueError("No valid image results found")
 
     # Sort by USN (already normalized)
-    results.sort(key=lambda r: r["header"].get("usn") or "ZZZZZZZZZZ")
+    results.sort(key=lambda r: r.usn or "ZZZZZZZZZZ")
 
     write_batch_results_excel(
         results=results,
@@ -0,0 +1,72 @@
+import argparse
+import multiprocessing
+import time
+import traceback
+
+from core.config import JOB_RESULT_MAX_AGE
+from batch.jobs import JobStore
+from batch.run_batch import run_pdf_batch
+
+POLL_INTERVAL = 1.0
+STALE_AFTER = 60 * 60  # seconds a job may stay RUNNING before it is retried
+PURGE_INTERVAL = 10 * 60  # seconds between sweeps of expired finished jobs
+
+
+def run_job(store: JobStore, job: dict):
+    job_id = job["id"]
+    input_dir = job["input_dir"]
+    output_excel = store.job_dir(job_id) / "VTU_Result.xlsx"
+
+    print(f"Running job {job_id}")
+
+    try:
+        run_pdf_batch(input_dir, job["template_path"], output_excel)
+        store.complete(job_id, output_excel)
+
+    except Exception as e:
+        # complete() / fail() remove the uploaded files
+        traceback.print_exc()
+        store.fail(job_id, str(e))
+
+
+def worker_loop(poll_interval: float = POLL_INTERVAL):
+    store = JobStore()
+    next_purge = 0.0
+
+    while True:
+        # Finished jobs are only kept JOB_RESULT_MAX_AGE (see JobStore.purge_finished)
+        if time.monotonic() >= next_purge:
+            store.purge_finished(JOB_RESULT_MAX_AGE)
+            next_purge = time.monotonic() + PURGE_INTERVAL
+
+        job = store.claim()
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+
+        run_job(store, job)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VTU batch job worker")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of jobs processed concurrently"
+    )
+    args = parser.parse_args()
+
+    JobStore().requeue_stale(STALE_AFTER)
+
+    # Non-daemon: each job may start its own PDF process pool
+    procs = [
+        multiprocessing.Process(target=worker_loop)
+        for _ in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
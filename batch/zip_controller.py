@@ -0,0 +1,135 @@
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from core.config import PDF_WORKERS, PARALLEL_MIN_FILES
+from core.records import StudentResult
+from batch.controller import get_pdf_cache
+from ingestion.archive import ZipArchive
+from services.result_cache import content_key
+from services.vtu_pdf_parser import parse_vtu_pdf, PARSER_VERSION
+
+
+def iter_zip_pdf_results(
+    archive: ZipArchive,
+    members: list,
+    workers: int | None = None,
+    mp_context=None
+):
+    """
+    Yields parse_vtu_pdf results in member order.
+
+    Each member is read out of the archive just before it is parsed,
+    so the pool starts on the first PDFs while later ones are still
+    packed, and at most 2 x workers PDFs are held in memory.
+    Cached results (same bytes, same PARSER_VERSION) are reused.
+    mp_context: start method for the pool (None = platform default).
+    """
+    workers = PDF_WORKERS if workers is None else workers
+    cache = get_pdf_cache()
+
+    pool = None
+    if workers > 1 and len(members) >= PARALLEL_MIN_FILES:
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(members)),
+            mp_context=mp_context,
+        )
+
+    # (cache key or None, result or future) per member, oldest first
+    pending = deque()
+
+    def finish():
+        key, outcome = pending.popleft()
+        result = outcome.result() if pool and key is not None else outcome
+        if key is not None and cache is not None:
+            cache.put(key, result.to_json())
+        return result
+
+    try:
+        for member in members:
+            data = archive.read(member)
+            key = content_key(data, f"pdf-v{PARSER_VERSION}")
+
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                pending.append((None, StudentResult.from_json(cached)))
+            elif pool is not None:
+                pending.append((key, pool.submit(parse_vtu_pdf, data)))
+            else:
+                pending.append((key, parse_vtu_pdf(data)))
+
+            while len(pending) > 2 * workers:
+                yield finish()
+
+        while pending:
+            yield finish()
+
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def collect_zip_results(zip_source, workers: int | None = None) -> list[StudentResult]:
+    """
+    Results for an uploaded ZIP (path or seekable stream) of PDFs
+    and/or result photos, laid out like a batch input folder:
+    - PDF = one student
+    - single image = one student, folder of images = multi-page student
+
+    PDFs and images are parsed concurrently: the OCR pipeline runs on
+    its own thread while PDFs go through the process pool. Members are
+    read from the archive as each pipeline reaches them; nothing is
+    extracted to disk.
+    """
+    with ZipArchive(zip_source) as archive:
+        pdfs = [m for m in archive.members if m.kind == "pdf"]
+
+        # (label, kind, [page loaders]) per student, in archive order
+        students = {}
+        for member in archive.members:
+            if member.kind == "image":
+                _, _, pages = students.setdefault(
+                    member.student,
+                    (member.student, "folder" if member.in_folder else "image", [])
+                )
+                pages.append(partial(archive.read, member))
+
+        image_results = []
+        image_error = []
+        image_thread = None
+        mp_context = None
+
+        if students:
+            # OCR stack (cv2 / doctr) is only imported for image input
+            from batch.image_controller import run_image_students
+
+            def run_images():
+                try:
+                    image_results.extend(run_image_students(list(students.values())))
+                except Exception as e:
+                    image_error.append(e)
+
+            image_thread = threading.Thread(target=run_images, name="zip-images")
+            image_thread.start()
+
+            # The OCR thread may be running torch threads by the time the
+            # PDF pool starts, which fork() does not copy safely
+            mp_context = multiprocessing.get_context("spawn")
+
+        try:
+            results = []
+            pdf_results = iter_zip_pdf_results(archive, pdfs, workers, mp_context)
+
+            for member in pdfs:
+                print(f"Processing PDF: {member.name}")
+                results.append(next(pdf_results))
+        finally:
+            if image_thread is not None:
+                image_thread.join()
+
+        if image_error:
+            raise image_error[0]
+
+    return results + image_results
@@ -1,5 +1,7 @@
 # core/config.py
 
+import os
+
 SUBJECT_CODE_REGEX = r"[A-Z]{3,5}\d{3,4}[A-Z]?"
 RESULT_REGEX = r"[PFAXW]"
 
@@ -7,3 +9,73 @@ CONFIDENCE_THRESHOLDS = {
     "OK": 0.85,
     "PARTIAL": 0.6
 }
+
+# Batch PDF parsing
+# PDF_WORKERS=1 forces serial parsing
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", os.cpu_count() or 1))
+PARALLEL_MIN_FILES = int(os.environ.get("PARALLEL_MIN_FILES", 4))
+
+# Uploads
+# Files up to this size stay in memory, bigger ones spill to temp/
+SPOOL_MAX_MEMORY = int(os.environ.get("SPOOL_MAX_MEMORY", 8 * 1024 * 1024))
+TEMP_MAX_AGE = int(os.environ.get("TEMP_MAX_AGE", 60 * 60))  # seconds
+# Finished /jobs stay downloadable this long, then the worker deletes
+# their row and folder (workbook included)
+JOB_RESULT_MAX_AGE = int(os.environ.get("JOB_RESULT_MAX_AGE", 24 * 60 * 60))  # seconds
+
+# ZIP uploads are read member by member, never extracted to disk.
+# Limits guard against zip bombs: sizes are uncompressed bytes, and a
+# member may not expand to more than ZIP_MAX_RATIO x its packed size
+ZIP_MAX_MEMBERS = int(os.environ.get("ZIP_MAX_MEMBERS", 2000))
+ZIP_MAX_MEMBER_BYTES = int(os.environ.get("ZIP_MAX_MEMBER_BYTES", 32 * 1024 * 1024))
+ZIP_MAX_TOTAL_BYTES = int(os.environ.get("ZIP_MAX_TOTAL_BYTES", 512 * 1024 * 1024))
+ZIP_MAX_RATIO = int(os.environ.get("ZIP_MAX_RATIO", 100))
+
+# Parsed PDF result cache (PDF_CACHE_MAX_BYTES=0 disables it)
+PDF_CACHE_PATH = os.environ.get(
+    "PDF_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "pdf_results.db")
+)
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# PDF text extraction engine: "plumber" | "pdfminer" | "words"
+# Anything but "plumber" falls back to it when its output fails validation
+PDF_EXTRACTOR = os.environ.get("PDF_EXTRACTOR", "pdfminer")
+
+# OCR: images per predictor call (pages from many students are pooled)
+# and per detection forward pass
+OCR_BATCH_SIZE = int(os.environ.get("OCR_BATCH_SIZE", 8))
+OCR_DET_BATCH_SIZE = int(os.environ.get("OCR_DET_BATCH_SIZE", OCR_BATCH_SIZE))
+
+# Image batch pipeline: processes decoding/enhancing photos while the
+# model runs (OCR_ENHANCE_WORKERS=1 keeps it in-process), and how many
+# pages may be waiting between stages
+OCR_ENHANCE_WORKERS = int(os.environ.get("OCR_ENHANCE_WORKERS", os.cpu_count() or 1))
+OCR_PIPELINE_DEPTH = int(os.environ.get("OCR_PIPELINE_DEPTH", 2 * OCR_BATCH_SIZE))
+
+# OCR variant cascade: OCR variants one at a time (most-winning first)
+# and stop at the first whose OCRScorer score reaches OCR_GOOD_SCORE (max ~144)
+OCR_CASCADE = os.environ.get("OCR_CASCADE", "1") == "1"
+OCR_GOOD_SCORE = int(os.environ.get("OCR_GOOD_SCORE", 100))
+# Variant ranking: past wins fade by OCR_VARIANT_DECAY per page (1 = never),
+# and every OCR_VARIANT_EXPLORE-th cascade batch leads with a runner-up
+# instead of the leader (0 = never), so the order can still change
+OCR_VARIANT_DECAY = float(os.environ.get("OCR_VARIANT_DECAY", 0.995))
+OCR_VARIANT_EXPLORE = int(os.environ.get("OCR_VARIANT_EXPLORE", 20))
+OCR_VARIANT_STATS_PATH = os.environ.get(
+    "OCR_VARIANT_STATS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "ocr_variant_stats.db")
+)
+
+# OCR input: crop photos to the result sheet found on a 1/4-scale
+# pre-pass and cap the sheet's width at OCR_TARGET_DPI (A4 width)
+OCR_CROP_TO_SHEET = os.environ.get("OCR_CROP_TO_SHEET", "1") == "1"
+OCR_TARGET_DPI = int(os.environ.get("OCR_TARGET_DPI", 300))
+
+# OCR result cache: (image sha256, load settings, variant, model) -> text + score
+# (OCR_CACHE_MAX_BYTES=0 disables it)
+OCR_CACHE_PATH = os.environ.get(
+    "OCR_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "ocr_results.db")
+)
+OCR_CACHE_MAX_BYTES = int(os.environ.get("OCR_CACHE_MAX_BYTES", 64 * 1024 * 1024))
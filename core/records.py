@@ -0,0 +1,58 @@
+# core/records.py
+
+"""
+Result records shared by every stage (regex_engine -> aggregation ->
+export). Slotted dataclasses: no per-instance __dict__, and one field
+set for both the PDF and OCR paths (always `subject_code`, never `code`).
+
+Stages pass these objects along as-is; nothing rebuilds them.
+"""
+
+from dataclasses import dataclass, field
+
+from regex_engine.confidence import flag_from_confidence
+
+
+@dataclass(slots=True)
+class SubjectResult:
+    subject_code: str
+    internal: int | None = None
+    external: int | None = None
+    total: int | None = None
+    result: str | None = None
+    date: str | None = None         # announced date, OCR only
+    confidence: float | None = None
+
+    @property
+    def flag(self) -> str | None:
+        if self.confidence is None:
+            return None
+        return flag_from_confidence(self.confidence)
+
+    def to_json(self) -> list:
+        return [
+            self.subject_code, self.internal, self.external, self.total,
+            self.result, self.date, self.confidence,
+        ]
+
+    @classmethod
+    def from_json(cls, data: list) -> "SubjectResult":
+        return cls(*data)
+
+
+@dataclass(slots=True)
+class StudentResult:
+    usn: str | None = None
+    name: str | None = None
+    subjects: list[SubjectResult] = field(default_factory=list)
+
+    def to_json(self) -> list:
+        """
+        Compact JSON-safe form for the result cache.
+        """
+        return [self.usn, self.name, [s.to_json() for s in self.subjects]]
+
+    @classmethod
+    def from_json(cls, data: list) -> "StudentResult":
+        usn, name, subjects = data
+        return cls(usn, name, [SubjectResult.from_json(s) for s in subjects])
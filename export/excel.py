@@ -1,11 +1,12 @@
 # backend/export/excel.py
 
+from core.records import StudentResult
 from export.template_loader import load_template
 from export.writer import write_student_result
 
 
 def write_result_excel(
-    result: dict,
+    result: StudentResult,
     template_path: str,
     output_path: str,
     row_index: int = 6
@@ -22,13 +23,7 @@ def write_result_excel(
         wb=wb,
         ws=ws,
         subject_column_map=subject_column_map,
-        result_data={
-            "header": {
-                "usn": result["usn"],
-                "name": result["name"]
-            },
-            "subjects": result["subjects"]
-        },
+        result_data=result,
         row_index=row_index,
         sl_no=1,
         total_sum_col=total_col,
@@ -1,57 +1,34 @@
+from core.records import StudentResult
 from export.template_loader import load_template
 from openpyxl.styles import Font, PatternFill
-from export.writer import write_student_result, TOPPER_FILL
+from export.writer import (
+    apply_result_formatting,
+    compile_write_plan,
+    register_result_styles,
+    write_student_results,
+)
 
 
 def write_batch_results_excel(
-    results: list[dict],
+    results: list[StudentResult],
     template_path: str,
     output_path: str,
     start_row: int = 6
 ):
     wb, ws, subject_column_map, total_col, percentage_col = load_template(template_path)
 
-    row = start_row
-    sl_no = 1
-    topper_tracker = []
+    plan = compile_write_plan(subject_column_map, total_col, percentage_col)
 
-    for result in results:
-        wb, numeric_total = write_student_result(
-            wb=wb,
-            ws=ws,
-            subject_column_map=subject_column_map,
-            result_data={
-                "header": result["header"],
-                "subjects": result["subjects"]
-            },
-            row_index=row,
-            sl_no=sl_no,
-            total_sum_col=total_col,
-            percentage_col=percentage_col
-        )
-
-        topper_tracker.append((row, numeric_total))
-        row += 1
-        sl_no += 1
+    # 🔤 Bold columns / PE / NSS are named styles set while writing
+    register_result_styles(wb)
+    topper_tracker = write_student_results(ws, plan, results, start_row)
 
-    # 🏆 Highlight class topper
+    # 🏆 Class topper + subject fail highlighting
     if topper_tracker:
         topper_row, _ = max(topper_tracker, key=lambda x: x[1])
-        for col in range(1, ws.max_column + 1):
-            ws.cell(row=topper_row, column=col).fill = TOPPER_FILL
-
-    # 🔤 Bold important columns
-    bold_font = Font(bold=True)
-    BOLD_COLUMNS = {1, 2, 3, total_col, percentage_col}
-
-    for cols in subject_column_map.values():
-        if "TOTAL" in cols:
-            BOLD_COLUMNS.add(cols["TOTAL"])
-
-    for row_cells in ws.iter_rows():
-        for cell in row_cells:
-            if cell.column in BOLD_COLUMNS:
-                cell.font = bold_font
+        apply_result_formatting(
+            ws, plan, start_row, start_row + len(topper_tracker) - 1, topper_row
+        )
 
     # 🗂 Legend
     LEGEND_FAIL = PatternFill(start_color="FFD60A", end_color="FFD60A", fill_type="solid")
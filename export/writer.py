@@ -1,7 +1,11 @@
 from openpyxl.workbook.workbook import Workbook
-from openpyxl.styles import PatternFill
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
 import re
 
+from core.records import StudentResult
+
 # Colours
 FAIL_FILL = PatternFill(start_color="FFD60A", end_color="FFD60A", fill_type="solid")
 PE_FILL = PatternFill(start_color="CFE2F3", end_color="CFE2F3", fill_type="solid")
@@ -13,6 +17,26 @@ NO_EXTERNAL_FAIL_SUBJECTS = set()
 MAJOR_PROJECT_SUBJECTS = {"BAI786"}
 MINI_PROJECT_SUBJECTS = {"BAI586"}
 
+# Named styles for data cells (registered once per workbook)
+BOLD_STYLE = "Result Bold"
+PE_STYLE = "Result PE"
+NSS_STYLE = "Result NSS"
+ACTIVITY_STYLES = {"BPEK559": PE_STYLE, "BNSK559": NSS_STYLE}
+
+
+def register_result_styles(wb: Workbook):
+    styles = {
+        BOLD_STYLE: {"font": Font(bold=True)},
+        PE_STYLE: {"fill": PE_FILL},
+        PE_STYLE + " Bold": {"fill": PE_FILL, "font": Font(bold=True)},
+        NSS_STYLE: {"fill": NSS_FILL},
+        NSS_STYLE + " Bold": {"fill": NSS_FILL, "font": Font(bold=True)},
+    }
+    for name, attrs in styles.items():
+        if name not in wb.named_styles:
+            wb.add_named_style(NamedStyle(name=name, **attrs))
+
+
 def is_activity_subject(code: str) -> bool:
     return bool(code) and code[-1] == "9"
 
@@ -27,141 +51,255 @@ def subject_sort_key(code: str):
     return (prefix, int(number), suffix)
 
 
-def write_student_result(
-    wb: Workbook,
-    ws,
+def compile_write_plan(
     subject_column_map: dict,
-    result_data: dict,
-    row_index: int,
-    sl_no: int,
     total_sum_col: int | None,
     percentage_col: int | None,
-):
-    header = result_data["header"]
-    subjects = sorted(
-        result_data["subjects"],
-        key=lambda s: subject_sort_key(s.get("subject_code", ""))
-    )
-
-    for s in subjects:
-        print(" ", s["subject_code"], s["internal"], s["external"], s["total"])
-
-    # print("\nSUBJECT COLUMN MAP KEYS:")
-    for k in subject_column_map:
-        print(" ", k)
-
-    # Student info
-    ws.cell(row=row_index, column=1).value = sl_no
-    ws.cell(row=row_index, column=2).value = header["usn"]
-    ws.cell(row=row_index, column=3).value = header["name"]
+) -> dict:
+    """
+    Everything about a template's layout the row builder needs,
+    computed once per template instead of once per student.
+    """
+    activity_keys = [k for k in subject_column_map if "/" in k]
 
+    subject_slots = {}
+    for code, cols in subject_column_map.items():
+        if code in activity_keys:
+            continue
+        subject_slots[code] = (
+            cols["INTERNAL"],
+            cols["EXTERNAL"],
+            cols["TOTAL"],
+            200 if code in MAJOR_PROJECT_SUBJECTS else 100,
+            code not in IGNORE_FAIL_COLOR_SUBJECTS,
+        )
+
+    activity_slots = [
+        (
+            subject_column_map[k]["INTERNAL"],
+            subject_column_map[k]["EXTERNAL"],
+            subject_column_map[k]["TOTAL"],
+        )
+        for k in activity_keys
+    ]
+
+    all_cols = [3, total_sum_col or 0, percentage_col or 0]
+    for cols in subject_column_map.values():
+        all_cols.extend(cols.values())
+
+    bold_cols = {1, 2, 3, total_sum_col, percentage_col}
+    bold_cols.update(cols["TOTAL"] for cols in subject_column_map.values())
+    bold_cols.discard(None)
+
+    return {
+        "subject_slots": subject_slots,
+        "activity_slots": activity_slots,
+        "total_sum_col": total_sum_col,
+        "percentage_col": percentage_col,
+        "width": max(all_cols),
+        "bold_cols": sorted(bold_cols),
+    }
+
+
+def build_student_row(plan: dict, result_data: StudentResult, sl_no: int):
+    """
+    Builds one student's row in a single pass over their subjects.
+
+    Returns (values, styles, numeric_total) where values[col - 1]
+    is the cell value and styles is a list of (col, named style)
+    for activity cells. Fail marks are left to conditional formatting.
+    Subjects without marks (unreadable OCR rows) stay blank and count
+    towards neither the total nor the percentage.
+    """
+    subject_slots = plan["subject_slots"]
+    has_activity_slots = bool(plan["activity_slots"])
+
+    values = [None] * plan["width"]
+    values[0] = sl_no
+    values[1] = result_data.usn
+    values[2] = result_data.name
+
+    styles = []
     numeric_total = 0
     max_total = 0
     activity_subjects = []
 
-    # Detect activity slots FIRST
-    activity_keys = [k for k in subject_column_map if "/" in k]
-    has_activity_slots = bool(activity_keys)
-
-    # print("\nACTIVITY SLOTS IN TEMPLATE:", activity_keys)
-    # print("HAS ACTIVITY SLOTS:", has_activity_slots)
-
     # ---------- MAIN SUBJECT LOOP ----------
-    for subject in subjects:
-        code = subject.get("subject_code")
-        # print("\nPROCESSING SUBJECT:", code)
+    for subject in result_data.subjects:
+        code = subject.subject_code
 
         if not code:
-            # print("  ⛔ skipped: empty code")
             continue
 
         if is_activity_subject(code) and has_activity_slots:
-            # print("  ➡ routed as ACTIVITY subject")
             activity_subjects.append(subject)
             continue
 
-        if code not in subject_column_map:
-            # print("  ⛔ skipped: code not in subject_column_map")
+        slot = subject_slots.get(code)
+        if slot is None:
             continue
 
-        cols = subject_column_map[code]
-        # print("  ✅ writing to columns:", cols)
+        int_col, ext_col, tot_col, subject_max, _ = slot
 
-        int_marks = subject["internal"]
-        ext_marks = subject["external"]
-        tot_marks = subject["total"]
+        int_marks = subject.internal
+        ext_marks = subject.external
+        tot_marks = subject.total
 
-        int_cell = ws.cell(row=row_index, column=cols["INTERNAL"])
-        ext_cell = ws.cell(row=row_index, column=cols["EXTERNAL"])
-        tot_cell = ws.cell(row=row_index, column=cols["TOTAL"])
+        values[int_col - 1] = int_marks
+        values[ext_col - 1] = ext_marks
+        values[tot_col - 1] = tot_marks
 
-        int_cell.value = int_marks
-        ext_cell.value = ext_marks
-        tot_cell.value = tot_marks
+        # OCR rows may have no marks: blank cells, not part of the totals
+        if tot_marks is None:
+            continue
 
-        fail = False
-        if code not in IGNORE_FAIL_COLOR_SUBJECTS:
-            fail = int_marks < 18 or ext_marks < 18 or tot_marks < 36
+        numeric_total += tot_marks
+        max_total += subject_max
 
-        if fail:
-            # print("  ❌ FAIL → marking yellow")
-            int_cell.fill = FAIL_FILL
-            ext_cell.fill = FAIL_FILL
-            tot_cell.fill = FAIL_FILL
+    # ---------- ACTIVITY SUBJECTS ----------
+    # Slots are filled in subject-code order
+    activity_subjects.sort(key=lambda s: subject_sort_key(s.subject_code))
 
-        numeric_total += tot_marks
-        if code in MAJOR_PROJECT_SUBJECTS:
-            max_total+=200
-        else:
-            max_total+=100
+    for activity_subject, cols in zip(activity_subjects, plan["activity_slots"]):
+        int_col, ext_col, tot_col = cols
 
-        # print("  ✔ added to total:", tot_marks)
-        # print("  ✔ max_total now:", max_total)
+        values[int_col - 1] = activity_subject.internal
+        values[ext_col - 1] = activity_subject.external
+        values[tot_col - 1] = activity_subject.total
 
-    # ---------- ACTIVITY SUBJECTS ----------
-    # print("\nACTIVITY SUBJECTS COLLECTED:", [s["subject_code"] for s in activity_subjects])
+        style = ACTIVITY_STYLES.get(activity_subject.subject_code)
+        if style:
+            styles.append((int_col, style))
+            styles.append((ext_col, style))
+            styles.append((tot_col, style))
 
-    for activity_subject, activity_key in zip(activity_subjects, activity_keys):
-        # print("WRITING ACTIVITY:", activity_subject["subject_code"], "→", activity_key)
+        if activity_subject.total is not None:
+            numeric_total += activity_subject.total
+            max_total += 100
 
-        cols = subject_column_map[activity_key]
+    # ---------- GRAND TOTAL ----------
+    if plan["total_sum_col"]:
+        values[plan["total_sum_col"] - 1] = numeric_total
 
-        int_cell = ws.cell(row=row_index, column=cols["INTERNAL"])
-        ext_cell = ws.cell(row=row_index, column=cols["EXTERNAL"])
-        tot_cell = ws.cell(row=row_index, column=cols["TOTAL"])
+    # ---------- PERCENTAGE ----------
+    if plan["percentage_col"] and max_total > 0:
+        percentage = round((numeric_total / max_total) * 100, 1)
+        values[plan["percentage_col"] - 1] = percentage
 
-        int_cell.value = activity_subject["internal"]
-        ext_cell.value = activity_subject["external"]
-        tot_cell.value = activity_subject["total"]
+    return values, styles, numeric_total
 
-        if activity_subject["subject_code"] == "BPEK559":
-            fill = PE_FILL
-        elif activity_subject["subject_code"] == "BNSK559":
-            fill = NSS_FILL
-        else:
-            fill = None
 
-        if fill:
-            int_cell.fill = fill
-            ext_cell.fill = fill
-            tot_cell.fill = fill
+def write_row(ws, plan: dict, row_index: int, values: list, styles: list):
+    for col, value in enumerate(values, 1):
+        if value is not None:
+            ws.cell(row=row_index, column=col, value=value)
 
-        numeric_total += activity_subject["total"]
-        max_total += 100
+    for col in plan["bold_cols"]:
+        if values[col - 1] is not None:
+            ws.cell(row=row_index, column=col).style = BOLD_STYLE
 
-    # print("\nFINAL TOTAL:", numeric_total)
-    # print("FINAL MAX:", max_total)
+    for col, style in styles:
+        if col in plan["bold_cols"]:
+            style += " Bold"
+        ws.cell(row=row_index, column=col).style = style
 
-    # ---------- GRAND TOTAL ----------
-    if total_sum_col:
-        ws.cell(row=row_index, column=total_sum_col).value = numeric_total
 
-    # ---------- PERCENTAGE ----------
-    if percentage_col and max_total > 0:
-        percentage = round((numeric_total / max_total) * 100, 1)
-        ws.cell(row=row_index, column=percentage_col).value = percentage
-        # print("FINAL %:", percentage)
+def apply_result_formatting(
+    ws,
+    plan: dict,
+    start_row: int,
+    end_row: int,
+    topper_row: int | None = None,
+    topper: bool = True,
+):
+    """
+    Adds sheet-level conditional formatting for rows start_row..end_row:
+    class topper first (wins over fail marks), then one fail rule per
+    subject. A handful of rules replaces per-cell fills on every row.
+    topper=False adds only the fail rules (single-student export, where
+    the one row would always be its own "topper").
+    """
+    if end_row < start_row:
+        return
+
+    last_col = get_column_letter(ws.max_column)
+    total_sum_col = plan["total_sum_col"]
+
+    # 🏆 Class topper
+    if topper and total_sum_col:
+        total = get_column_letter(total_sum_col)
+        ws.conditional_formatting.add(
+            f"A{start_row}:{last_col}{end_row}",
+            FormulaRule(
+                formula=[f"${total}{start_row}=MAX(${total}${start_row}:${total}${end_row})"],
+                fill=TOPPER_FILL,
+                stopIfTrue=True
+            )
+        )
+    elif topper and topper_row:
+        ws.conditional_formatting.add(
+            f"A{topper_row}:{last_col}{topper_row}",
+            FormulaRule(formula=["TRUE"], fill=TOPPER_FILL, stopIfTrue=True)
+        )
+
+    # Subject fail
+    for int_col, ext_col, tot_col, _, check_fail in plan["subject_slots"].values():
+        if not check_fail:
+            continue
 
-    # print("==============================\n")
+        i, e, t = (get_column_letter(c) for c in (int_col, ext_col, tot_col))
+        r = start_row
+        ws.conditional_formatting.add(
+            f"{i}{start_row}:{t}{end_row}",
+            FormulaRule(
+                formula=[f"AND(ISNUMBER(${t}{r}),OR(${i}{r}<18,${e}{r}<18,${t}{r}<36))"],
+                fill=FAIL_FILL
+            )
+        )
+
+
+def write_student_results(
+    ws,
+    plan: dict,
+    results: list[StudentResult],
+    start_row: int,
+) -> list[tuple[int, int]]:
+    """
+    Writes all students starting at start_row.
+    Returns [(row_index, numeric_total), ...] in write order.
+    """
+    totals = []
+
+    for offset, result_data in enumerate(results):
+        row_index = start_row + offset
+        values, styles, numeric_total = build_student_row(
+            plan, result_data, sl_no=offset + 1
+        )
+        write_row(ws, plan, row_index, values, styles)
+        totals.append((row_index, numeric_total))
+
+    return totals
+
+
+def write_student_result(
+    wb: Workbook,
+    ws,
+    subject_column_map: dict,
+    result_data: StudentResult,
+    row_index: int,
+    sl_no: int,
+    total_sum_col: int | None,
+    percentage_col: int | None,
+):
+    """
+    Single-student convenience wrapper.
+    Batch callers should compile the plan once and use write_student_results().
+    """
+    plan = compile_write_plan(subject_column_map, total_sum_col, percentage_col)
+    values, styles, numeric_total = build_student_row(plan, result_data, sl_no)
+
+    register_result_styles(wb)
+    write_row(ws, plan, row_index, values, styles)
+    apply_result_formatting(ws, plan, row_index, row_index, topper=False)
 
     return wb, numeric_total
@@ -0,0 +1,188 @@
+"""
+Reads uploaded ZIP archives in place, member by member.
+
+Nothing is extracted to disk: the central directory (at the end of the
+archive) is read once, each member is classified by name and by its
+first bytes, and member contents are decompressed into memory only
+when a pipeline asks for them. Uploads are spooled, seekable files,
+so the first member can be parsed before the rest are read.
+
+Zip-bomb guards (core/config.py):
+  - at most ZIP_MAX_MEMBERS entries
+  - each member at most ZIP_MAX_MEMBER_BYTES once decompressed
+  - the archive at most ZIP_MAX_TOTAL_BYTES once decompressed
+  - no member expanding more than ZIP_MAX_RATIO x its packed size
+Declared sizes are checked up front, actual bytes while reading.
+"""
+
+import threading
+import zipfile
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+
+from core.config import (
+    ZIP_MAX_MEMBERS,
+    ZIP_MAX_MEMBER_BYTES,
+    ZIP_MAX_TOTAL_BYTES,
+    ZIP_MAX_RATIO,
+)
+from ingestion.input_identifier import SNIFF_BYTES, classify_file
+
+READ_CHUNK = 1024 * 1024
+
+# Small members may legitimately compress very well (blank scans)
+RATIO_MIN_BYTES = 1024 * 1024
+
+# Archive-tool droppings, never student files
+JUNK_PREFIXES = ("__MACOSX/",)
+
+
+@dataclass(slots=True)
+class ZipMember:
+    name: str           # path inside the archive
+    kind: str           # "pdf" | "image"
+    student: str        # label of the student the member belongs to
+    in_folder: bool     # image page of a multi-page (folder) student
+    info: zipfile.ZipInfo
+
+
+class ZipArchive:
+    """
+    Open archive plus its classified members, in name order.
+    Safe to read() from several threads at once.
+    """
+
+    def __init__(self, source):
+        """
+        source: path or seekable binary stream
+        """
+        try:
+            self._zip = zipfile.ZipFile(source)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Not a valid ZIP archive: {e}")
+
+        self._lock = threading.Lock()
+        self.bytes_read = 0
+
+        try:
+            self.members = self._scan()
+        except Exception:
+            self._zip.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    # -------------------------------------------------
+    # CENTRAL DIRECTORY → CLASSIFIED MEMBERS
+    # -------------------------------------------------
+    def _scan(self) -> list[ZipMember]:
+        infos = [
+            info for info in self._zip.infolist()
+            if not info.is_dir() and not info.filename.startswith(JUNK_PREFIXES)
+        ]
+
+        if len(infos) > ZIP_MAX_MEMBERS:
+            raise ValueError(f"ZIP has {len(infos)} files, limit is {ZIP_MAX_MEMBERS}")
+
+        declared = sum(info.file_size for info in infos)
+        if declared > ZIP_MAX_TOTAL_BYTES:
+            raise ValueError(
+                f"ZIP expands to {declared} bytes, limit is {ZIP_MAX_TOTAL_BYTES}"
+            )
+
+        for info in infos:
+            self._check_declared(info)
+
+        # A single wrapping folder ("class.zip" -> "class/...") is not a student
+        paths = [PurePosixPath(info.filename).parts for info in infos]
+        roots = {parts[0] for parts in paths if len(parts) > 1}
+        strip = len(roots) == 1 and all(len(parts) > 1 for parts in paths)
+
+        members = []
+        for info, parts in sorted(zip(infos, paths), key=lambda item: item[1]):
+            if strip:
+                parts = parts[1:]
+            if parts[-1].startswith("."):
+                continue
+
+            kind = self._classify(info)
+            if kind is None:
+                continue
+
+            # Same grouping as an upload folder: PDFs and loose images are one
+            # student each, images inside a folder are one multi-page student
+            in_folder = kind == "image" and len(parts) > 1
+            student = parts[0] if in_folder else "/".join(parts)
+
+            members.append(ZipMember(info.filename, kind, student, in_folder, info))
+
+        return members
+
+    def _check_declared(self, info: zipfile.ZipInfo):
+        if info.file_size > ZIP_MAX_MEMBER_BYTES:
+            raise ValueError(
+                f"{info.filename}: {info.file_size} bytes, limit is {ZIP_MAX_MEMBER_BYTES}"
+            )
+
+        if (
+            info.file_size > RATIO_MIN_BYTES
+            and info.file_size > ZIP_MAX_RATIO * max(info.compress_size, 1)
+        ):
+            raise ValueError(f"{info.filename}: suspicious compression ratio")
+
+    def _classify(self, info: zipfile.ZipInfo) -> str | None:
+        """
+        "pdf" | "image" by content (see classify_file),
+        None (with a warning) for anything else.
+        """
+        try:
+            with self._zip.open(info) as member:
+                head = member.read(SNIFF_BYTES)
+        except (RuntimeError, NotImplementedError, zipfile.BadZipFile) as e:
+            # encrypted / unsupported compression / corrupt entry
+            print(f"⚠️ Skipping {info.filename}: {e}")
+            return None
+
+        kind = classify_file(info.filename, head)
+
+        if kind == "zip":
+            print(f"⚠️ Skipping nested archive: {info.filename}")
+            return None
+
+        return kind
+
+    # -------------------------------------------------
+    # MEMBER CONTENTS
+    # -------------------------------------------------
+    def read(self, member: ZipMember) -> bytes:
+        """
+        Decompressed contents of one member. Reads in chunks and stops
+        as soon as a limit is crossed, whatever the headers claimed.
+        """
+        limit = min(
+            ZIP_MAX_MEMBER_BYTES,
+            max(ZIP_MAX_RATIO * member.info.compress_size, RATIO_MIN_BYTES),
+        )
+        chunks = []
+        size = 0
+
+        with self._zip.open(member.info) as stream:
+            while chunk := stream.read(READ_CHUNK):
+                size += len(chunk)
+                if size > limit:
+                    raise ValueError(f"{member.name}: expands past {limit} bytes")
+                chunks.append(chunk)
+
+        with self._lock:
+            self.bytes_read += size
+            if self.bytes_read > ZIP_MAX_TOTAL_BYTES:
+                raise ValueError(f"ZIP expands past {ZIP_MAX_TOTAL_BYTES} bytes")
+
+        return b"".join(chunks)
@@ -1,21 +1,99 @@
 import cv2
+import hashlib
 import numpy as np
 import os
-from typing import List, Tuple
+from pathlib import Path
+from collections.abc import Mapping
+
+from core.config import OCR_CROP_TO_SHEET, OCR_TARGET_DPI
+
+VARIANT_NAMES = ("original", "gray", "denoise", "clahe", "sharpen", "threshold")
+
+# Sheet detection pre-pass
+PREPASS_SCALE = 4
+MIN_SHEET_FRACTION = 0.2   # smaller "sheets" are noise -> keep the whole frame
+INK_MIN_FRACTION = 0.005   # rows/cols with less ink than this are blank margin
+PAD_FRACTION = 0.02
+A4_WIDTH_INCHES = 8.27
+
+REDUCED_COLOR = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+def decode_image(source: str | bytes, flags: int = cv2.IMREAD_COLOR):
+    """
+    cv2.imread for a path, cv2.imdecode for file bytes (e.g. a ZIP member).
+    None if the data can't be decoded.
+    """
+    if isinstance(source, bytes):
+        return cv2.imdecode(np.frombuffer(source, np.uint8), flags)
+    return cv2.imread(source, flags)
+
+
+def find_sheet_region(gray: np.ndarray):
+    """
+    (x0, y0, x1, y1) of the printed part of the result sheet in
+    gray's coordinates, or None if no sheet stands out.
+
+    The paper is the largest bright blob (Otsu); a projection
+    profile of dark pixels inside it trims blank margins.
+    """
+    h, w = gray.shape
+    blur = cv2.GaussianBlur(gray, (5, 5), 0)
+
+    threshold, paper = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    paper = cv2.morphologyEx(paper, cv2.MORPH_CLOSE, np.ones((15, 15), np.uint8))
+
+    contours, _ = cv2.findContours(paper, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+
+    sheet = max(contours, key=cv2.contourArea)
+    if cv2.contourArea(sheet) < MIN_SHEET_FRACTION * h * w:
+        return None
+
+    x, y, sw, sh = cv2.boundingRect(sheet)
+
+    ink = blur[y:y + sh, x:x + sw] < threshold
+    rows = np.flatnonzero(ink.mean(axis=1) > INK_MIN_FRACTION)
+    cols = np.flatnonzero(ink.mean(axis=0) > INK_MIN_FRACTION)
+    if rows.size == 0 or cols.size == 0:
+        return None
+
+    pad = int(PAD_FRACTION * max(sw, sh))
+    return (
+        max(x + cols[0] - pad, 0),
+        max(y + rows[0] - pad, 0),
+        min(x + cols[-1] + 1 + pad, w),
+        min(y + rows[-1] + 1 + pad, h),
+    )
 
 
 class ImageEnhancer:
     def __init__(
         self,
         debug: bool = False,
-        debug_dir: str = "debug_images"
+        debug_dir: str = "debug_images",
+        crop_to_sheet: bool = OCR_CROP_TO_SHEET,
+        target_dpi: int = OCR_TARGET_DPI
     ):
         """
-        debug      : Save original + enhanced images
-        debug_dir  : Directory to store debug images
+        debug         : Save original + enhanced images
+        debug_dir     : Directory to store debug images
+        crop_to_sheet : Enhance/OCR only the detected result sheet
+        target_dpi    : Sheet width cap (A4 at this DPI) when cropping
         """
         self.debug = debug
         self.debug_dir = debug_dir
+        self.crop_to_sheet = crop_to_sheet
+        self.target_width = int(A4_WIDTH_INCHES * target_dpi)
+
+        # Identifies what load_image() makes of a file (OCR cache keys)
+        self.settings = f"sheet{target_dpi}" if crop_to_sheet else "full"
 
         if self.debug:
             os.makedirs(self.debug_dir, exist_ok=True)
@@ -23,15 +101,20 @@ class ImageEnhancer:
     # -------------------------------------------------
     # IMAGE LOADING (UPLOAD / TEMP FILE SUPPORT)
     # -------------------------------------------------
-    def load_image(self, image_path: str):
+    def load_image(self, image_path: str | bytes):
         """
-        Load image from disk.
+        Load image from disk, or from its file bytes (cropped to
+        the result sheet when crop_to_sheet is on).
         Raises error if image is invalid.
         """
-        image = cv2.imread(image_path)
+        if self.crop_to_sheet:
+            image = self.load_sheet(image_path)
+        else:
+            image = decode_image(image_path)
 
         if image is None:
-            raise ValueError(f"Failed to load image: {image_path}")
+            label = image_path if isinstance(image_path, str) else "in-memory image"
+            raise ValueError(f"Failed to load image: {label}")
 
         if self.debug:
             cv2.imwrite(
@@ -41,75 +124,164 @@ class ImageEnhancer:
 
         return image
 
+    def load_sheet(self, image_path: str | bytes):
+        """
+        Finds the sheet on a 1/4-scale grayscale decode, then decodes
+        at the coarsest JPEG reduction that keeps the sheet at least
+        target_width wide, crops it and downsizes to target_width.
+        Returns None if the file can't be decoded.
+        """
+        small = decode_image(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        if small is None:
+            return None
+
+        region = find_sheet_region(small)
+        if region is None:
+            region = (0, 0, small.shape[1], small.shape[0])
+        x0, y0, x1, y1 = region
+
+        sheet_width = (x1 - x0) * PREPASS_SCALE
+        factor = max(
+            (f for f in REDUCED_COLOR if sheet_width // f >= self.target_width),
+            default=1
+        )
+
+        image = decode_image(image_path, REDUCED_COLOR[factor])
+        if image is None:
+            return None
+
+        scale = PREPASS_SCALE / factor
+        sheet = image[int(y0 * scale):int(y1 * scale), int(x0 * scale):int(x1 * scale)]
+
+        if sheet.shape[1] > self.target_width:
+            height = round(sheet.shape[0] * self.target_width / sheet.shape[1])
+            return cv2.resize(sheet, (self.target_width, height), interpolation=cv2.INTER_AREA)
+
+        # Own buffer, so the full frame can be freed
+        return sheet.copy()
+
     # -------------------------------------------------
     # ENHANCEMENT PIPELINE
     # -------------------------------------------------
-    def enhance_variants(self, img) -> List[Tuple[str, np.ndarray]]:
-        """
-        Generates progressive enhancement variants.
-        Returns list of (variant_name, image)
-        """
-        variants = []
+    # Each level builds on earlier ones through `v`, so shared
+    # intermediates (gray, denoise, clahe) are computed once.
 
+    def _original(self, v):
         # ---------- Level 0: Original ----------
-        variants.append(("original", img))
+        return v.image
 
+    def _gray(self, v):
         # ---------- Level 1: Grayscale ----------
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        variants.append(("gray", gray))
+        return cv2.cvtColor(v["original"], cv2.COLOR_BGR2GRAY)
 
-        # ---------- Level 2: Denoise ----------
-        denoised = cv2.fastNlMeansDenoising(
-            gray,
+    def _denoise(self, v):
+        # ---------- Level 2: Denoise (slowest level) ----------
+        return cv2.fastNlMeansDenoising(
+            v["gray"],
             h=30,
             templateWindowSize=7,
             searchWindowSize=21
         )
-        variants.append(("denoise", denoised))
 
+    def _clahe(self, v):
         # ---------- Level 3: CLAHE (BEST FOR OCR) ----------
-        clahe = cv2.createCLAHE(
+        return cv2.createCLAHE(
             clipLimit=2.0,
             tileGridSize=(8, 8)
-        ).apply(denoised)
-        variants.append(("clahe", clahe))
+        ).apply(v["denoise"])
 
+    def _sharpen(self, v):
         # ---------- Level 4: Mild Sharpen ----------
         sharpen_kernel = np.array([
             [0, -1, 0],
             [-1, 5, -1],
             [0, -1, 0]
         ])
-        sharpen = cv2.filter2D(clahe, -1, sharpen_kernel)
-        variants.append(("sharpen", sharpen))
+        return cv2.filter2D(v["clahe"], -1, sharpen_kernel)
 
+    def _threshold(self, v):
         # ---------- Level 5: Adaptive Threshold (LAST RESORT) ----------
-        threshold = cv2.adaptiveThreshold(
-            clahe,
+        return cv2.adaptiveThreshold(
+            v["clahe"],
             255,
             cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
             cv2.THRESH_BINARY,
             11,
             2
         )
-        variants.append(("threshold", threshold))
 
+    def _save_debug(self, name: str, image):
         # ---------- SAVE DEBUG IMAGES ----------
-        if self.debug:
-            for idx, (name, image) in enumerate(variants):
-                filename = f"{idx:02d}_{name}.png"
-                path = os.path.join(self.debug_dir, filename)
-                cv2.imwrite(path, image)
+        idx = VARIANT_NAMES.index(name)
+        path = os.path.join(self.debug_dir, f"{idx:02d}_{name}.png")
+        cv2.imwrite(path, image)
 
-        return variants
+    def enhance_variants(self, img, source_hash: str | None = None) -> "EnhancementVariants":
+        """
+        Progressive enhancement variants as a lazy mapping
+        variant_name -> image, in VARIANT_NAMES order.
+        Nothing is computed until a variant is read.
+        source_hash (sha256 of the image file) enables OCR caching.
+        """
+        return EnhancementVariants(self, img, source_hash)
 
     # -------------------------------------------------
     # FULL FLOW (LOAD → ENHANCE)
     # -------------------------------------------------
-    def process_image(self, image_path: str):
+    def process_image(self, image_path: str | bytes, source_hash: str | None = None):
         """
         Convenience method:
-        Loads image and returns enhancement variants.
+        Loads image (path or file bytes) and returns (lazy) enhancement variants.
+        source_hash: sha256 of the file when already known (input manifest).
         """
+        if source_hash is None:
+            data = image_path if isinstance(image_path, bytes) else Path(image_path).read_bytes()
+            source_hash = hashlib.sha256(data).hexdigest()
+
         image = self.load_image(image_path)
-        return self.enhance_variants(image)
+        return self.enhance_variants(image, source_hash)
+
+
+class EnhancementVariants(Mapping):
+    """
+    Read-only mapping of variant name -> image where each level
+    is built on first access and memoized. Readers that stop
+    early (e.g. the OCR cascade) never pay for later levels.
+    """
+
+    def __init__(
+        self,
+        enhancer: ImageEnhancer,
+        image: np.ndarray,
+        source_hash: str | None = None
+    ):
+        self.image = image
+        self._enhancer = enhancer
+        self._built = {}
+
+        # Same file + same load settings -> same pixels for every variant
+        self.cache_tag = f"{enhancer.settings}:{source_hash}" if source_hash else None
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        image = self._built.get(name)
+        if image is None:
+            if name not in VARIANT_NAMES:
+                raise KeyError(name)
+
+            image = getattr(self._enhancer, f"_{name}")(self)
+            self._built[name] = image
+
+            if self._enhancer.debug:
+                self._enhancer._save_debug(name, image)
+
+        return image
+
+    def __iter__(self):
+        return iter(VARIANT_NAMES)
+
+    def __len__(self) -> int:
+        return len(VARIANT_NAMES)
+
+    def built(self) -> list[str]:
+        """Names of the variants computed so far."""
+        return list(self._built)
@@ -1,22 +1,74 @@
-from doctr.io import DocumentFile
-from doctr.models import ocr_predictor
+import threading
+
+import cv2
+import numpy as np
+
+from core.config import OCR_DET_BATCH_SIZE
+
+# doctr (and torch) load on the first OCR call, not at import
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_ocr_model():
+    """
+    The doctr predictor, built once per process (CPU-safe).
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from doctr.models import ocr_predictor
+
+                _model = ocr_predictor(
+                    det_arch="db_resnet50",
+                    reco_arch="crnn_vgg16_bn",
+                    pretrained=True,
+                    det_bs=OCR_DET_BATCH_SIZE
+                )
+    return _model
+
+
+def to_page(img: np.ndarray) -> np.ndarray:
+    """
+    Enhancer output (BGR or single-channel) -> the uint8 RGB
+    page array doctr expects, without touching disk.
+    """
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+def page_lines(page) -> list[str]:
+    lines = []
+    for block in page.blocks:
+        for line in block.lines:
+            words = [w.value for w in line.words]
+            lines.append(" ".join(words))
+
+    return lines
+
+
+def run_doctr_ocr_batch(images: list[np.ndarray]) -> list[str]:
+    """
+    OCRs several in-memory images in one predictor call
+    (batched detection / recognition). Texts come back in input order.
+    """
+    if not images:
+        return []
+
+    result = get_ocr_model()([to_page(img) for img in images])
+    return ["\n".join(page_lines(page)) for page in result.pages]
 
-# Load once (CPU-safe)
-model = ocr_predictor(
-    det_arch="db_resnet50",
-    reco_arch="crnn_vgg16_bn",
-    pretrained=True
-)
 
 def run_doctr_ocr(image_path: str) -> str:
+    from doctr.io import DocumentFile
+
     doc = DocumentFile.from_images(image_path)
-    result = model(doc)
+    result = get_ocr_model()(doc)
 
     lines = []
     for page in result.pages:
-        for block in page.blocks:
-            for line in block.lines:
-                words = [w.value for w in line.words]
-                lines.append(" ".join(words))
+        lines.extend(page_lines(page))
 
     return "\n".join(lines)
@@ -0,0 +1,27 @@
+# Kept free of cv2 / doctr imports so the API can report stats cheaply
+
+from core.config import OCR_CACHE_PATH, OCR_CACHE_MAX_BYTES
+from services.result_cache import ResultCache
+
+# Bump with any change to the model or recognizer settings
+OCR_MODEL_VERSION = "db_resnet50-crnn_vgg16_bn-1"
+
+_ocr_cache = None
+
+
+def get_ocr_cache() -> ResultCache | None:
+    global _ocr_cache
+    if _ocr_cache is None and OCR_CACHE_MAX_BYTES > 0:
+        _ocr_cache = ResultCache(OCR_CACHE_PATH, OCR_CACHE_MAX_BYTES)
+    return _ocr_cache
+
+
+def ocr_cache_key(page, variant: str) -> str | None:
+    """
+    Cache key for one variant of a page, or None if the page's
+    source image is unknown (not loaded through ImageEnhancer).
+    """
+    tag = getattr(page, "cache_tag", None)
+    if tag is None:
+        return None
+    return f"ocr-{OCR_MODEL_VERSION}:{variant}:{tag}"
@@ -1,30 +1,160 @@
-import cv2
-import tempfile
-from backend.ingestion.image.ocr import run_doctr_ocr
-from app.core.ocr_variant_selector import score_ocr_text
+from core.config import (
+    OCR_BATCH_SIZE,
+    OCR_CASCADE,
+    OCR_GOOD_SCORE,
+    OCR_VARIANT_DECAY,
+    OCR_VARIANT_EXPLORE,
+    OCR_VARIANT_STATS_PATH,
+)
+from ingestion.image.ocr import run_doctr_ocr_batch
+from ingestion.image.ocr_cache import get_ocr_cache, ocr_cache_key
+from ingestion.image.scorer import OCRScorer
+from ingestion.image.variant_stats import VariantStats
 
+scorer = OCRScorer()
 
-def run_best_ocr_variant(image_path: str, variants):
+_variant_stats = None
+
+
+def get_variant_stats() -> VariantStats:
+    global _variant_stats
+    if _variant_stats is None:
+        _variant_stats = VariantStats(
+            OCR_VARIANT_STATS_PATH,
+            decay=OCR_VARIANT_DECAY,
+            explore_every=OCR_VARIANT_EXPLORE,
+        )
+    return _variant_stats
+
+
+def ocr_in_batches(images: list, batch_size: int = OCR_BATCH_SIZE) -> list[str]:
     """
-    Runs OCR on selected enhancement variants
-    and returns the best OCR text.
+    OCR texts for images, in order, running the model on
+    at most batch_size images per call.
     """
+    texts = []
+    for start in range(0, len(images), batch_size):
+        texts.extend(run_doctr_ocr_batch(images[start:start + batch_size]))
+    return texts
 
-    best_score = -1
-    best_text = ""
 
-    for name, img in variants:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            cv2.imwrite(tmp.name, img)
-            text = run_doctr_ocr(tmp.name)
+def ocr_variants(jobs: list[tuple]) -> list[tuple[str, int]]:
+    """
+    (text, score) for each (page, variant name) job, in order.
+
+    Results come from the OCR cache where possible; each distinct
+    uncached image is OCR'd once and the result is stored.
+    """
+    cache = get_ocr_cache()
+    keys = [ocr_cache_key(page, name) for page, name in jobs]
+    cached = cache.get_many([k for k in keys if k]) if cache else {}
+
+    # cache key (job index if uncacheable) -> job index to run;
+    # a duplicate upload shares its key and is only run once
+    todo = {}
+    for j, key in enumerate(keys):
+        if key is None:
+            todo[j] = j
+        elif key not in cached and key not in todo:
+            todo[key] = j
 
-        score = score_ocr_text(text)
+    images = []
+    for j in todo.values():
+        page, name = jobs[j]
+        images.append(page[name])
+
+    texts = ocr_in_batches(images)
+
+    fresh = dict(zip(todo, zip(texts, scorer.score_many(texts))))
+
+    if cache:
+        cache.put_many({k: list(v) for k, v in fresh.items() if isinstance(k, str)})
+
+    outcomes = []
+    for j, key in enumerate(keys):
+        if key is None:
+            outcomes.append(fresh[j])
+        elif key in cached:
+            text, score = cached[key]
+            outcomes.append((text, score))
+        else:
+            outcomes.append(fresh[key])
+
+    return outcomes
+
+
+def run_best_ocr_variants(
+    pages: list,
+    cascade: bool = OCR_CASCADE,
+    good_score: int = OCR_GOOD_SCORE,
+) -> list[str]:
+    """
+    Best OCR text for each page, in order. pages holds one
+    enhancer variant mapping (name -> image) per page; pages from
+    different students can be mixed, they are only pooled for
+    inference.
 
-        # Debug hook (optional)
-        # print(f"    OCR variant={name:8s} score={score}")
+    cascade=False: every variant of every page is OCR'd, in batches;
+    ties keep the earlier variant.
 
-        if score > best_score:
-            best_score = score
-            best_text = text
+    cascade=True: variants are tried in rounds, recently best first
+    (now and then a runner-up first, see VariantStats). Each round
+    OCRs the next variant of every page still below good_score, as
+    one batch. A page that never gets there
+    keeps the best text seen, as without cascade. Only the variants
+    actually tried are ever computed.
+
+    Variants OCR'd before (same image file) come from the OCR cache
+    without being enhanced or run through the model.
+    """
+    if not pages:
+        return []
+
+    stats = get_variant_stats()
+    names = list(pages[0])
+    if cascade:
+        names = stats.order(names, explore=True)
+        rounds = [[name] for name in names]
+    else:
+        rounds = [names]
+
+    # page index -> (score, text, variant name)
+    best = [(-1, "", None)] * len(pages)
+    pending = list(range(len(pages)))
+
+    for round_names in rounds:
+        if not pending:
+            break
+
+        jobs = [(p, name) for p in pending for name in round_names]
+        outcomes = ocr_variants([(pages[p], name) for p, name in jobs])
+
+        for (p, name), (text, score) in zip(jobs, outcomes):
+            # Debug hook (optional)
+            # print(f"    OCR page={p} variant={name:8s} score={score}")
+
+            if score > best[p][0]:
+                best[p] = (score, text, name)
+
+        if cascade:
+            pending = [p for p in pending if best[p][0] < good_score]
+
+    stats.record_wins([name for _, _, name in best if name])
+
+    return [text for _, text, _ in best]
+
+
+def run_best_ocr_variant(
+    image_path: str,
+    variants,
+    cascade: bool = OCR_CASCADE,
+    good_score: int = OCR_GOOD_SCORE,
+):
+    """
+    Runs OCR on selected enhancement variants
+    and returns the best OCR text (single-page run_best_ocr_variants).
+    """
+    if not variants:
+        return ""
 
-    return best_text
+    return run_best_ocr_variants([variants], cascade, good_score)[0]
@@ -1,4 +1,38 @@
 import re
+import string
+
+# Subject codes (BCS401, BAD402, BCSL404), marks and a lone "P" are all
+# whole words, so one scan anchored on a word boundary finds all three
+WORD_FEATURES = re.compile(r"\b(?:([A-Z]{3,4}L?\d{3})|(\d{1,3})|(P))\b")
+
+# Literal prefix lets re skip ahead to "20"; the leading \b is checked by hand
+DATE_PATTERN = re.compile(r"20\d{2}[-/]\d{2}[-/]\d{2}\b")
+WORD_CHAR = re.compile(r"\w")
+
+GARBAGE = re.compile(r"[~^|<>]{3,}")
+GARBAGE_CHARS = "~^|<>"
+
+ASCII_ALNUM = (string.ascii_letters + string.digits).encode()
+
+
+def has_date(t: str) -> bool:
+    """Same as re.search(r"\b20\d{2}[-/]\d{2}[-/]\d{2}\b", t)."""
+    pos = 0
+    while True:
+        match = DATE_PATTERN.search(t, pos)
+        if match is None:
+            return False
+        start = match.start()
+        if start == 0 or not WORD_CHAR.match(t, start - 1):
+            return True
+        pos = start + 1
+
+
+def count_alnum(text: str) -> int:
+    """Same as sum(c.isalnum() for c in text)."""
+    if text.isascii():
+        return len(text) - len(text.encode().translate(None, ASCII_ALNUM))
+    return sum(map(str.isalnum, text))
 
 
 class OCRScorer:
@@ -29,38 +63,39 @@ class OCRScorer:
         if "VTU" in t or "VISVESVARAYA" in t:
             score += 5
 
-        # --------------------------------------------------
-        # 2. SUBJECT CODES (TABLE DETECTION)
-        # Examples: BCS401, BAD402, BCSL404
-        # --------------------------------------------------
-        subject_codes = re.findall(r"\b[A-Z]{3,4}L?\d{3}\b", t)
-        score += min(len(subject_codes) * 4, 40)
+        if "RESULT" in t:
+            score += 4
 
         # --------------------------------------------------
-        # 3. MARKS & NUMERIC DENSITY
+        # 2-4. SUBJECT CODES, MARKS, PASS COLUMN (one scan)
         # --------------------------------------------------
-        marks = re.findall(r"\b\d{1,3}\b", t)
-        score += min(len(marks), 30)
+        codes = marks = 0
+        has_pass = False
 
-        # --------------------------------------------------
-        # 4. PASS / FAIL / RESULT COLUMN
-        # --------------------------------------------------
-        if re.search(r"\bP\b", t):
-            score += 5
+        for code, mark, _ in WORD_FEATURES.findall(t):
+            if mark:
+                marks += 1
+            elif code:
+                codes += 1
+            else:
+                has_pass = True
 
-        if "RESULT" in t:
-            score += 4
+        score += min(codes * 4, 40)
+        score += min(marks, 30)
+
+        if has_pass:
+            score += 5
 
         # --------------------------------------------------
         # 5. DATE DETECTION (ANNOUNCED ON)
         # --------------------------------------------------
-        if re.search(r"\b20\d{2}[-/]\d{2}[-/]\d{2}\b", t):
+        if has_date(t):
             score += 5
 
         # --------------------------------------------------
         # 6. ALPHANUMERIC RATIO (GARBAGE FILTER)
         # --------------------------------------------------
-        alnum_ratio = sum(c.isalnum() for c in text) / max(len(text), 1)
+        alnum_ratio = count_alnum(text) / max(len(text), 1)
 
         if alnum_ratio > 0.75:
             score += 10
@@ -72,20 +107,25 @@ class OCRScorer:
         # --------------------------------------------------
         # 7. LINE STRUCTURE BONUS
         # --------------------------------------------------
-        lines = [l for l in text.splitlines() if len(l.strip()) > 3]
+        lines = sum(1 for l in text.splitlines() if len(l.strip()) > 3)
 
-        if len(lines) > 25:
+        if lines > 25:
             score += 10
-        elif len(lines) > 15:
+        elif lines > 15:
             score += 5
 
         # --------------------------------------------------
         # 8. HARD PENALTIES (BROKEN OCR)
         # --------------------------------------------------
-        if re.search(r"[~^|<>]{3,}", text):
+        if any(c in text for c in GARBAGE_CHARS) and GARBAGE.search(text):
             score -= 15
 
         if score < 0:
             score = 0
 
         return score
+
+    def score_many(self, texts: list[str]) -> list[int]:
+        """Scores for several candidate texts, in order."""
+        score = self.score
+        return [score(text) for text in texts]
@@ -0,0 +1,95 @@
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS variant_scores (
+    name   TEXT PRIMARY KEY,
+    score  REAL NOT NULL
+);
+"""
+
+
+class VariantStats:
+    """
+    How often each enhancement variant produced the chosen OCR text,
+    persisted in SQLite so every OCR worker learns from the others.
+
+    Wins decay: every recorded page scales all scores by `decay`, so
+    recent pages outweigh old ones and a variant that stops winning
+    loses its place. A cascade only tries later variants on pages the
+    leader fails, so the leader is also challenged on purpose: every
+    `explore_every`-th order() call leads with another variant, in turn.
+    """
+
+    def __init__(self, db_path: Path, decay: float = 1.0, explore_every: int = 0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.decay = decay
+        self.explore_every = explore_every
+        self._orders = 0
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def scores(self) -> dict:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT name, score FROM variant_scores"))
+
+    def order(self, names: list[str], explore: bool = False) -> list[str]:
+        """
+        names sorted by score, highest first; unseen variants and
+        ties keep the enhancer's order.
+        explore: count this call towards exploration; on every
+        explore_every-th one a runner-up (in rotation) goes first.
+        """
+        scores = self.scores()
+        ranked = sorted(names, key=lambda name: -scores.get(name, 0))
+
+        if explore and self.explore_every > 0 and len(ranked) > 1:
+            self._orders += 1
+            if self._orders % self.explore_every == 0:
+                turn = self._orders // self.explore_every
+                challenger = ranked.pop(1 + (turn - 1) % (len(ranked) - 1))
+                ranked.insert(0, challenger)
+
+        return ranked
+
+    def record_wins(self, names: list[str]):
+        """
+        One win per entry (a name may repeat). Existing scores
+        decay once per entry before the new wins are added.
+        """
+        if not names:
+            return
+
+        counts = {}
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.decay != 1.0:
+                    conn.execute(
+                        "UPDATE variant_scores SET score = score * ?",
+                        (self.decay ** len(names),)
+                    )
+                conn.executemany(
+                    "INSERT INTO variant_scores (name, score) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET score = score + excluded.score",
+                    list(counts.items())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
@@ -4,66 +4,123 @@ IMAGE_EXTS = {".jpg", ".jpeg", ".png",}
 PDF_EXTS = {".pdf"}
 ZIP_EXTS = {".zip"}
 
+# Leading bytes -> file type; enough to tell uploads apart
+# without trusting their names
+MAGIC_TYPES = {
+    b"%PDF-": "pdf",
+    b"\x89PNG\r\n\x1a\n": "image",
+    b"\xff\xd8\xff": "image",       # JPEG
+    b"PK\x03\x04": "zip",
+    b"PK\x05\x06": "zip",            # empty archive
+}
+SNIFF_BYTES = max(len(magic) for magic in MAGIC_TYPES)
+
+
+def sniff_type(head: bytes) -> str | None:
+    """
+    "pdf" | "image" | "zip" from a file's first SNIFF_BYTES bytes,
+    None if it is none of them.
+    """
+    for magic, kind in MAGIC_TYPES.items():
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def type_from_name(name: str) -> str | None:
+    """
+    The type a file name claims, by extension.
+    """
+    suffix = Path(name).suffix.lower()
+    if suffix in PDF_EXTS:
+        return "pdf"
+    if suffix in IMAGE_EXTS:
+        return "image"
+    if suffix in ZIP_EXTS:
+        return "zip"
+    return None
+
+
+def classify_file(name: str, head: bytes) -> str | None:
+    """
+    A file's type by content (see sniff_type). The name only matters
+    for the warning when the two disagree, so a mislabeled upload is
+    routed by what it really is and a broken one never reaches a parser.
+    """
+    kind = sniff_type(head)
+    claimed = type_from_name(name)
+
+    if kind is None:
+        if claimed is not None:
+            print(f"⚠️ Skipping {name}: not a valid {claimed} file")
+        return None
+
+    if claimed != kind:
+        print(f"⚠️ {name} is a {kind} file, reading it as one")
+
+    return kind
+
 
 def identify_input(paths: list[str]) -> dict:
     """
-    Identify user input type and mode.
+    Identify user input type and mode from file contents.
 
     Returns:
     {
-        "type": "pdf" | "image" | "invalid",
+        "type": "pdf" | "image" | "zip" | "invalid",
         "mode": "single" | "batch" | None,
-        "reason": str | None
+        "reason": str | None,
+        "manifest": [ManifestEntry] | None   (pass on to the batch stages)
     }
     """
+    # Imported here: ingestion.manifest builds on this module
+    from ingestion.manifest import build_manifest
 
     if not paths:
         return {
             "type": "invalid",
             "mode": None,
-            "reason": "No files provided"
+            "reason": "No files provided",
+            "manifest": None
         }
 
-    extensions = set()
-    has_folder = False
-
-    for p in paths:
-        path = Path(p)
-        if path.is_dir():
-            has_folder = True
-            for file in path.rglob("*"):
-                if file.is_file():
-                    extensions.add(file.suffix.lower())
-        else:
-            extensions.add(path.suffix.lower())
+    # One walk: type (by magic bytes), size and hash of every file
+    manifest = build_manifest(paths)
+    kinds = {entry.kind for entry in manifest}
+    has_folder = any(Path(p).is_dir() for p in paths)
 
     # ---------------- PDF ----------------
-    if extensions.issubset(PDF_EXTS):
+    if kinds.issubset({"pdf"}):
         return {
             "type": "pdf",
             "mode": "single" if len(paths) == 1 else "batch",
-            "reason": None
+            "reason": None,
+            "manifest": manifest
         }
 
     # ---------------- IMAGE ----------------
-    if extensions.issubset(IMAGE_EXTS):
+    if kinds.issubset({"image"}):
         return {
             "type": "image",
             "mode": "single" if len(paths) == 1 and not has_folder else "batch",
-            "reason": None
+            "reason": None,
+            "manifest": manifest
         }
 
     # ---------------- ZIP ----------------
-    if extensions.issubset(ZIP_EXTS):
+    # Members are classified when the archive is read (batch/zip_controller.py)
+    if kinds.issubset({"zip"}):
         return {
-            "type": "image",
+            "type": "zip",
             "mode": "batch",
-            "reason": None
+            "reason": None,
+            "manifest": manifest
         }
 
     # ---------------- INVALID ----------------
     return {
         "type": "invalid",
         "mode": None,
-        "reason": "Mixed or unsupported file types"
+        "reason": "Mixed or unsupported file types",
+        "manifest": None
     }
@@ -0,0 +1,139 @@
+"""
+PDF text-extraction engines.
+
+Every engine takes a path or seekable binary stream and yields
+plain text one page at a time, in the shape normalize_text()
+expects: one table row per line, header fields as "Label : value".
+A page's layout objects are released before the next page is read,
+and closing the generator early skips the remaining pages.
+"""
+
+from io import StringIO
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.utils import open_filename
+
+# Wide char_margin keeps a table row on one line; no boxes_flow
+# skips the text-box ordering pass we don't need
+PDFMINER_LAPARAMS = LAParams(
+    line_margin=0.1,
+    char_margin=50,
+    boxes_flow=None,
+    detect_vertical=False,
+)
+
+# Words whose tops differ by less than this share a line
+LINE_TOLERANCE = 3
+
+TABLE_START = "University"
+TABLE_END = "Nomenclature"
+
+
+def plumber_engine(pdf):
+    """
+    Full pdfplumber layout analysis (reference engine).
+    """
+    # Imported on use: with the default engine it is only the fallback
+    import pdfplumber
+
+    with pdfplumber.open(pdf) as doc:
+        for page in doc.pages:
+            page_text = page.extract_text()
+            page.close()
+            if page_text:
+                yield page_text + "\n"
+
+
+def pdfminer_engine(pdf):
+    """
+    pdfminer directly, with layout parameters tuned for the VTU sheet.
+    Same output as pdfminer.high_level.extract_text, page by page.
+    """
+    with open_filename(pdf, "rb") as fp, StringIO() as output:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, output, laparams=PDFMINER_LAPARAMS)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+        for page in PDFPage.get_pages(fp, caching=True):
+            interpreter.process_page(page)
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+
+def words_to_lines(words: list[dict]) -> list[str]:
+    lines = []
+    current = []
+    current_top = None
+
+    for word in sorted(words, key=lambda w: (round(w["top"]), w["x0"])):
+        if current and abs(word["top"] - current_top) > LINE_TOLERANCE:
+            lines.append(" ".join(w["text"] for w in sorted(current, key=lambda w: w["x0"])))
+            current = []
+        if not current:
+            current_top = word["top"]
+        current.append(word)
+
+    if current:
+        lines.append(" ".join(w["text"] for w in sorted(current, key=lambda w: w["x0"])))
+
+    return lines
+
+
+def anchor_top(chars: list[dict], anchor: str) -> float | None:
+    """
+    Top of the highest occurrence of anchor in the page's raw chars.
+    Cheap: no word clustering, unlike searching extract_words().
+    """
+    text = "".join(c["text"] for c in chars)
+    tops = []
+
+    start = text.find(anchor)
+    while start != -1:
+        tops.append(chars[start]["top"])
+        start = text.find(anchor, start + 1)
+
+    return min(tops, default=None)
+
+
+def words_engine(pdf):
+    """
+    Words and coordinates only, cropped to the band between the
+    header ("University Seat Number") and the footer ("Nomenclature").
+    The anchors are found in the raw chars and the page is cropped
+    before extract_words(), so words outside the table are never built.
+    Continuation pages without those anchors are kept whole.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf) as doc:
+        for page in doc.pages:
+            chars = page.chars
+            top = anchor_top(chars, TABLE_START)
+            bottom = anchor_top(chars, TABLE_END)
+
+            if top is not None or bottom is not None:
+                band = page.crop((
+                    0,
+                    max(top - LINE_TOLERANCE, 0) if top is not None else 0,
+                    page.width,
+                    bottom - LINE_TOLERANCE if bottom is not None else page.height,
+                ))
+                words = band.extract_words()
+            else:
+                words = page.extract_words()
+            page.close()
+
+            lines = words_to_lines(words)
+            if lines:
+                yield "\n".join(lines) + "\n"
+
+
+ENGINES = {
+    "plumber": plumber_engine,
+    "pdfminer": pdfminer_engine,
+    "words": words_engine,
+}
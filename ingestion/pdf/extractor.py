@@ -1,13 +1,87 @@
-import pdfplumber
+import io
+import re
 import warnings
+from typing import BinaryIO
+
+from core.config import PDF_EXTRACTOR, SUBJECT_CODE_REGEX
+from ingestion.pdf.engines import ENGINES, plumber_engine
+from ingestion.pdf.normalizer import normalize_text
+from parsing.header.pdf_header import USN_PATTERN
+from parsing.subjects.pdf_subjects import SUBJECT_ROW_PATTERN
 
 warnings.filterwarnings("ignore")
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
+LINE_START_CODE = re.compile(rf"^\s*({SUBJECT_CODE_REGEX})\s", re.MULTILINE)
+FOOTER_PATTERN = re.compile(r"Nomenclature", re.IGNORECASE)
+
+
+def read_pages(pages) -> str:
+    """
+    Consumes an engine's page generator and stops after the page
+    where the footer follows the subject table; later pages
+    (signature block etc.) are never processed.
+    """
+    parts = []
+    seen_table = False
+
+    try:
+        for page_text in pages:
+            parts.append(page_text)
+
+            if not seen_table:
+                seen_table = bool(LINE_START_CODE.search(page_text))
+
+            if seen_table and FOOTER_PATTERN.search(page_text):
+                break
+    finally:
+        # Releases the PDF file and any remaining pages
+        pages.close()
+
+    return "".join(parts)
+
+
+def is_valid_extraction(text: str) -> bool:
+    """
+    Cheap sanity check for a non-reference engine:
+    header present, and every subject code that starts a
+    line also yields a complete marks row.
+    """
+    if not text or not USN_PATTERN.search(text):
+        return False
+
+    codes = set(LINE_START_CODE.findall(text))
+    rows = {m.group(1) for m in SUBJECT_ROW_PATTERN.finditer(normalize_text(text))}
+
+    return bool(rows) and codes <= rows
+
+
+def extract_text_from_pdf(
+    pdf_path: str | bytes | BinaryIO,
+    engine: str | None = None
+) -> str:
+    """
+    pdf_path may be a file path, raw PDF bytes, or a seekable
+    binary stream (e.g. an uploaded file that never touched disk).
+
+    Pages are read one at a time until the results footer.
+    engine defaults to PDF_EXTRACTOR; pdfplumber's full layout
+    analysis is the fallback whenever another engine's output
+    fails is_valid_extraction().
+    """
+    if isinstance(pdf_path, bytes):
+        pdf_path = io.BytesIO(pdf_path)
+
+    engine = engine or PDF_EXTRACTOR
+
+    if engine != "plumber":
+        try:
+            text = read_pages(ENGINES[engine](pdf_path))
+            if is_valid_extraction(text):
+                return text
+        except Exception as e:
+            print(f"⚠️ {engine} extractor failed, falling back: {e}")
+
+        if hasattr(pdf_path, "seek"):
+            pdf_path.seek(0)
+
+    return read_pages(plumber_engine(pdf_path))
@@ -3,23 +3,152 @@ import re
 SUBJECT_CODE = r"[A-Z]{3,5}\d{3,4}[A-Z]?"
 RESULT = r"[PFAXW]"
 
+# Whitespace | digits | uppercase letters | anything else.
+# Maximal runs, so two tokens of the same kind never touch.
+TOKEN_PATTERN = re.compile(r"(\s+)|(\d+)|([A-Z]+)|([^\sA-Z\d]+)")
+WS, NUM, UPPER, OTHER = range(4)
+
+BLANKS = re.compile(r"[ \t\u00a0]+")
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+RESULT_CHARS = frozenset("PFAXW")
+
+
+def tokenize(text: str) -> list[tuple[int, str]]:
+    return [(m.lastindex - 1, m.group()) for m in TOKEN_PATTERN.finditer(text)]
+
+
+def match_code(tokens, i, off):
+    """
+    Subject code starting in tokens[i] (from char off), as the
+    SUBJECT_CODE regex would find it: the last 3-5 letters of the
+    run, the first 3-4 digits after them, and one optional letter.
+
+    Returns (prefix, code, end) where prefix is the part of the
+    letter run before the code and end is a (token, offset) position.
+    """
+    kind, tok = tokens[i]
+    if kind != UPPER or i + 1 >= len(tokens):
+        return None
+
+    letters = tok[off:]
+    next_kind, digits = tokens[i + 1]
+    if len(letters) < 3 or next_kind != NUM or len(digits) < 3:
+        return None
+
+    prefix, letters = letters[:-5], letters[-5:]
+    code = letters + digits[:4]
+
+    if len(digits) > 4:
+        return prefix, code, (i + 1, 4)
+
+    if i + 2 < len(tokens) and tokens[i + 2][0] == UPPER:
+        return prefix, code + tokens[i + 2][1][0], (i + 2, 1)
+
+    return prefix, code, (i + 2, 0)
+
+
+def scan_marks(tokens, i, off):
+    """
+    Marks row "IM EM TOTAL RESULT" starting exactly at tokens[i][off].
+    Returns (numbers, result, end) or None.
+    """
+    n = len(tokens)
+    numbers = [tokens[i][1][off:]]
+    j = i + 1
+
+    for _ in range(2):
+        if j + 1 >= n or tokens[j][0] != WS or tokens[j + 1][0] != NUM:
+            return None
+        numbers.append(tokens[j + 1][1])
+        j += 2
+
+    if (
+        j + 1 >= n
+        or tokens[j][0] != WS
+        or tokens[j + 1][0] != UPPER
+        or tokens[j + 1][1][0] not in RESULT_CHARS
+    ):
+        return None
+
+    return numbers, tokens[j + 1][1][0], (j + 1, 1)
+
+
+def find_marks(tokens, i, off):
+    """
+    First marks row at or after (i, off). Each token is looked at
+    once, and scan_marks() only peeks a fixed number of tokens ahead.
+    """
+    while i < len(tokens):
+        kind, tok = tokens[i]
+        if kind == NUM and off < len(tok):
+            found = scan_marks(tokens, i, off)
+            if found:
+                return found
+        i += 1
+        off = 0
+    return None
+
+
+def clean_segment(parts: list[str]) -> str:
+    return DATE_PATTERN.sub("", BLANKS.sub(" ", "".join(parts)))
+
+
 def normalize_text(text: str) -> str:
-    # 1. Remove non-breaking spaces
-    text = text.replace("\u00a0", " ")
+    """
+    Single left-to-right pass, linear in len(text):
+
+    - non-breaking spaces / runs of spaces and tabs -> one space
+    - SUBJECT_CODE <any text> IM EM TOTAL RESULT -> "CODE IM EM TOTAL RESULT"
+    - dates (YYYY-MM-DD) removed
+
+    Output matches the previous regex pipeline, including how a code
+    without marks picks up the next marks row, but a malformed row can
+    no longer trigger a rescan of the rest of the document per code.
+    """
+    tokens = tokenize(text)
+    n = len(tokens)
+
+    out = []
+    segment = []
+    i, off = 0, 0
+
+    while i < n:
+        code_match = match_code(tokens, i, off)
+        if not code_match:
+            segment.append(tokens[i][1][off:])
+            i += 1
+            off = 0
+            continue
+
+        prefix, code, (ci, coff) = code_match
+        found = find_marks(tokens, ci, coff)
+
+        # Regex backtracking: a 4-digit code may hand its last digit
+        # to IM when nothing else follows
+        if not found and len(tokens[i + 1][1]) >= 4:
+            found = scan_marks(tokens, i + 1, 3)
+            if found:
+                code = tokens[i][1][off:][-5:] + tokens[i + 1][1][:3]
+
+        if not found:
+            # No marks row after this code, so none after any later one
+            break
+
+        numbers, result, (i, off) = found
 
-    # 2. Collapse multiple spaces
-    text = re.sub(r"[ \t]+", " ", text)
+        segment.append(prefix)
+        out.append(clean_segment(segment))
+        out.append(f"{code} {' '.join(numbers)} {result}")
+        segment = []
 
-    # 3. Collapse subject blocks:
-    # SUBJECT_CODE <any text> IM EM TOTAL RESULT DATE
-    text = re.sub(
-        rf"({SUBJECT_CODE})(.*?)\n?\s*(\d+)\s+(\d+)\s+(\d+)\s+({RESULT})",
-        r"\1 \3 \4 \5 \6",
-        text,
-        flags=re.DOTALL
-    )
+        if off >= len(tokens[i][1]):
+            i += 1
+            off = 0
 
-    # 4. Remove dates (not needed for regex)
-    text = re.sub(r"\d{4}-\d{2}-\d{2}", "", text)
+    # Tail with no further subject rows
+    if i < n:
+        segment.append(tokens[i][1][off:])
+        segment.extend(tok for _, tok in tokens[i + 1:])
+    out.append(clean_segment(segment))
 
-    return text
+    return "".join(out)
@@ -1,11 +1,10 @@
-# NOTE: OCR pipeline uses `code`; PDF pipeline uses `subject_code`
-# Do not mix without normalization
-
 import re
+from dataclasses import asdict
 from typing import List, Dict
-from itertools import permutations
 from pathlib import Path
 
+from core.records import SubjectResult
+
 
 SUBJECT_CODE_REGEX = re.compile(r"\b[A-Z]{3,4}L?\d{3}[A-Z]?\b")
 DATE_REGEX = re.compile(r"\b20\d{2}-\d{2}-\d{2}\b")
@@ -37,6 +36,82 @@ def split_into_subject_blocks(ocr_text: str) -> List[str]:
     return blocks
 
 
+TOTAL_TOLERANCE = 2  # OCR may be off by this much: |(i + e) - t| <= 2
+
+
+def triplet_score(total: int, result_letter: str | None) -> int:
+    score = 0
+    if total >= 36:
+        score += 2
+    if result_letter == "P" and total >= 36:
+        score += 2
+    return score
+
+
+def best_marks_triplet(numbers: List[int], result_letter: str | None = None):
+    """
+    Best (internal, external, total) among ordered picks of three
+    different positions in numbers, with total <= 100 and
+    |(internal + external) - total| <= TOTAL_TOLERANCE.
+
+    Highest triplet_score wins; ties go to the earliest triplet in
+    itertools.permutations(numbers, 3) order. Instead of trying every
+    total, the totals that can pair with (i, e) are looked up by value,
+    so the work is O(n^2) rather than O(n^3).
+    """
+    # value -> first three positions holding it (a pair can only rule out two)
+    positions = {}
+    for idx, n in enumerate(numbers):
+        if n <= 100:
+            slots = positions.setdefault(n, [])
+            if len(slots) < 3:
+                slots.append(idx)
+
+    # i + e -> [(score, slots)] for every total within tolerance of it
+    fits = {}
+
+    # Score only grows with the total, so a total of 100 is the ceiling
+    top_score = triplet_score(100, result_letter)
+    best_score = -1
+    best_triplet = None
+
+    for a, i in enumerate(numbers):
+        for b, e in enumerate(numbers):
+            if a == b:
+                continue
+
+            marks_sum = i + e
+            candidates = fits.get(marks_sum)
+            if candidates is None:
+                candidates = fits[marks_sum] = [
+                    (triplet_score(t, result_letter), positions[t])
+                    for t in range(marks_sum - TOTAL_TOLERANCE, marks_sum + TOTAL_TOLERANCE + 1)
+                    if t in positions
+                ]
+
+            # Earliest position c for the best score this (a, b) can reach
+            pair_score = -1
+            pair_c = None
+            for score, slots in candidates:
+                c = next((c for c in slots if c != a and c != b), None)
+                if c is None:
+                    continue
+
+                if score > pair_score or (score == pair_score and c < pair_c):
+                    pair_score = score
+                    pair_c = c
+
+            # Pairs arrive in permutation order: only a strictly better score replaces
+            if pair_score > best_score:
+                best_score = pair_score
+                best_triplet = (i, e, numbers[pair_c])
+
+                if best_score == top_score:
+                    return best_triplet
+
+    return best_triplet
+
+
 def extract_marks(block: str) -> Dict:
     """
     Extraction-only marks logic with candidate filtering.
@@ -118,24 +193,7 @@ def extract_marks(block: str) -> Dict:
     # -------------------------------
     # Skip if PE already resolved
     if result["internal"] is None:
-        best_score = -1
-        best_triplet = None
-
-        for i, e, t in permutations(numbers, 3):
-            if t > 100:
-                continue
-            if abs((i + e) - t) > 2:
-                continue
-
-            score = 0
-            if t >= 36:
-                score += 2
-            if result["result"] == "P" and t >= 36:
-                score += 2
-
-            if score > best_score:
-                best_score = score
-                best_triplet = (i, e, t)
+        best_triplet = best_marks_triplet(numbers, result["result"])
 
         if best_triplet:
             result["internal"], result["external"], result["total"] = best_triplet
@@ -144,34 +202,22 @@ def extract_marks(block: str) -> Dict:
 
 
 
-def normalize_subject_block(block: str) -> Dict:
+def normalize_subject_block(block: str) -> SubjectResult | None:
     """
     Extracts structured fields from a single subject block.
     """
-    result = {
-        "code": None,
-        "internal": None,
-        "external": None,
-        "total": None,
-        "result": None,
-        "date": None
-    }
-
     # ---------- Subject Code ----------
     code_match = SUBJECT_CODE_REGEX.search(block)
     if not code_match:
         return None
 
-    result["code"] = code_match.group()
-
     # ---------- Marks ----------
     marks = extract_marks(block)
-    result.update(marks)
 
-    return result
+    return SubjectResult(subject_code=code_match.group(), **marks)
 
 
-def parse_vtu_table(ocr_text: str) -> List[Dict]:
+def parse_vtu_table(ocr_text: str) -> List[SubjectResult]:
     """
     Full VTU table parse (experimental).
     """
@@ -180,7 +226,7 @@ def parse_vtu_table(ocr_text: str) -> List[Dict]:
 
     for block in blocks:
         row = normalize_subject_block(block)
-        if row and row["code"]:
+        if row and row.subject_code:
             rows.append(row)
 
     return rows
@@ -195,5 +241,5 @@ if __name__ == "__main__":
 
     for r in rows:
         print("--------------------------------------------------")
-        for k, v in r.items():
+        for k, v in asdict(r).items():
             print(f"{k:10}: {v}")
@@ -1,17 +1,20 @@
 # regex_engine/confidence.py
 
-def compute_confidence(subject: dict) -> float:
+def compute_confidence(subject) -> float:
+    """
+    subject is a core.records.SubjectResult.
+    """
     score = 0.0
 
-    if subject.get("subject_code"):
+    if subject.subject_code:
         score += 0.4
-    if subject.get("internal") is not None:
+    if subject.internal is not None:
         score += 0.2
-    if subject.get("external") is not None:
+    if subject.external is not None:
         score += 0.2
-    if subject.get("total") is not None:
+    if subject.total is not None:
         score += 0.1
-    if subject.get("result"):
+    if subject.result:
         score += 0.1
 
     return round(score, 2)
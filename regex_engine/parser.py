@@ -1,26 +1,13 @@
-from app.regex_engine.header_regex import extract_header
-from app.regex_engine.subject_regex import extract_subjects
-from app.regex_engine.confidence import (
-    compute_confidence,
-    flag_from_confidence
-)
+from core.records import StudentResult
+from regex_engine.scanner import scan_result
+from regex_engine.confidence import compute_confidence
 
 
-def run_regex_pipeline(text: str) -> dict:
-    header = extract_header(text)
-    subjects = extract_subjects(text)
+def run_regex_pipeline(text: str) -> StudentResult:
+    result = scan_result(text)
 
-    processed_subjects = []
+    # flag is derived from confidence on SubjectResult
+    for subj in result.subjects:
+        subj.confidence = compute_confidence(subj)
 
-    for subj in subjects:
-        confidence = compute_confidence(subj)
-        processed_subjects.append({
-            **subj,
-            "confidence": confidence,
-            "flag": flag_from_confidence(confidence)
-        })
-
-    return {
-        "header": header,
-        "subjects": processed_subjects
-    }
+    return result
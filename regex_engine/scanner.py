@@ -0,0 +1,78 @@
+# regex_engine/scanner.py
+
+"""
+Single-pass scanner for normalized VTU result text.
+
+One compiled alternation finds the USN, the student name and every
+subject row while walking the text once, left to right. As soon as
+both header fields are known the remaining text is walked with the
+row pattern alone, so header alternatives are never retried on the
+subject table.
+
+Output is identical to extract_header() + extract_subjects():
+the first USN / name occurrence wins, rows come back in text order.
+Only the PDF path uses it: OCR pages are parsed by parse_vtu_table,
+whose text is too noisy for these exact row patterns.
+"""
+
+import re
+
+from core.config import SUBJECT_CODE_REGEX, RESULT_REGEX
+from core.records import StudentResult, SubjectResult
+from regex_engine.header_regex import normalize_usn
+
+ROW_REGEX = (
+    rf"(?P<code>{SUBJECT_CODE_REGEX})\s+"
+    r"(?P<internal>\d+)\s+(?P<external>\d+)\s+(?P<total>\d+)\s+"
+    rf"(?P<result>{RESULT_REGEX})"
+)
+
+# Header labels keep their case-insensitive match; subject rows stay case-sensitive
+RESULT_SCANNER = re.compile(
+    r"(?i:University Seat Number\s*:\s*(?P<usn>[A-Z0-9]+))"
+    r"|(?i:Student Name\s*:\s*(?P<name>[A-Z\s]+)\n)"
+    rf"|{ROW_REGEX}"
+)
+ROW_SCANNER = re.compile(ROW_REGEX)
+
+
+def _subject(match) -> SubjectResult:
+    return SubjectResult(
+        match["code"],
+        int(match["internal"]),
+        int(match["external"]),
+        int(match["total"]),
+        match["result"],
+    )
+
+
+def scan_result(text: str) -> StudentResult:
+    """
+    Returns the student's header fields and subject rows
+    from one walk over text.
+    """
+    usn = None
+    name = None
+    subjects = []
+
+    for match in RESULT_SCANNER.finditer(text):
+        if match["code"] is not None:
+            subjects.append(_subject(match))
+        elif match["usn"] is not None:
+            if usn is None:
+                usn = match["usn"]
+        elif name is None:
+            name = match["name"]
+
+        if usn is not None and name is not None:
+            # Header complete: the rest of the text can only hold rows
+            subjects.extend(_subject(m) for m in ROW_SCANNER.finditer(text, match.end()))
+            break
+
+    usn = usn.strip() if usn else None
+
+    return StudentResult(
+        usn=normalize_usn(usn) if usn else None,
+        name=name.strip() if name is not None else None,
+        subjects=subjects,
+    )
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key        TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name   TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL
+);
+"""
+
+
+def content_key(data: bytes, *parts: str) -> str:
+    """
+    sha256 of the content, namespaced by e.g. a parser version,
+    so bumping the version never returns stale results.
+    """
+    return hash_key(hashlib.sha256(data).hexdigest(), *parts)
+
+
+def hash_key(sha256: str, *parts: str) -> str:
+    """
+    content_key() for content whose sha256 is already known
+    (e.g. from the input manifest).
+    """
+    return ":".join([*parts, sha256])
+
+
+class ResultCache:
+    """
+    Persistent key -> JSON cache in a local SQLite file,
+    evicting least-recently-used entries once the stored
+    values exceed max_bytes. Hit/miss counters are persisted
+    so stats() covers every process sharing the file.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: list[str]) -> dict:
+        """
+        Returns {key: value} for the keys present and
+        marks them as recently used.
+        """
+        if not keys:
+            return {}
+
+        found = {}
+        unique = list(dict.fromkeys(keys))
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for key in unique:
+                row = conn.execute(
+                    "SELECT value FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    found[key] = json.loads(row[0])
+
+            now = time.time()
+            conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+            self._count(conn, "hits", sum(1 for k in keys if k in found))
+            self._count(conn, "misses", sum(1 for k in keys if k not in found))
+            conn.execute("COMMIT")
+
+        return found
+
+    def put_many(self, items: dict):
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            payload = json.dumps(value)
+            rows.append((key, payload, len(payload), now))
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+
+    def get(self, key: str):
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, value):
+        self.put_many({key: value})
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    # -----------------------
+    # Internal helpers
+    # -----------------------
+
+    def _count(self, conn, name: str, amount: int):
+        if amount:
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, amount)
+            )
+
+    def _evict(self, conn):
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_used"
+        ):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
@@ -1,73 +1,94 @@
-# backend/services/vtu_ocr_parser.py
+# services/vtu_ocr_parser.py
 
-# from backend.ingestion.image.enhancer import ImageEnhancer
-# from backend.ingestion.image.runner import run_best_ocr_variant
+# The OCR stack (cv2, torch, doctr) is imported inside the functions,
+# so PDF-only workers that import this module never load it.
 
-# from backend.parsing.header.ocr_header import extract_usn_and_name
-# from backend.parsing.subjects.ocr_subjects import parse_vtu_table
+from core.config import OCR_BATCH_SIZE
+from core.records import StudentResult
 
-# from backend.aggregation.accumulator import ResultAccumulator
 
-
-def parse_vtu_image(image_paths: list[str]) -> dict:
+def ocr_images(image_paths: list[str], group_size: int = OCR_BATCH_SIZE) -> list[str | None]:
     """
-    Public OCR API:
-    Parses one or more VTU result images and returns
-    dict-based structured output.
+    Best-variant OCR text for every image, in order (None if the
+    image can't be loaded). Images may belong to different students:
+    group_size pages at a time are enhanced and OCR'd together, so
+    the model runs on full batches and only one group is in memory.
     """
+    from ingestion.image.enhancer import ImageEnhancer
+    from ingestion.image.runner import run_best_ocr_variants
+
+    enhancer = ImageEnhancer(debug=False)
+    texts = []
 
-    # enhancer = ImageEnhancer(debug=False)
-    # accumulator = ResultAccumulator()
+    for start in range(0, len(image_paths), group_size):
+        group = image_paths[start:start + group_size]
+
+        # -----------------------------
+        # ENHANCE (lazy variants)
+        # -----------------------------
+        pages = {}
+        for i, image_path in enumerate(group):
+            try:
+                pages[i] = enhancer.process_image(image_path)
+            except ValueError as e:
+                print(f"⚠️ {e}")
 
-    for image_path in image_paths:
         # -----------------------------
-        # OCR (best variant)
+        # OCR (best variant, batched)
         # -----------------------------
-        # variants = enhancer.process_image(image_path)
+        best = dict(zip(pages, run_best_ocr_variants(list(pages.values()))))
+        texts.extend(best.get(i) for i in range(len(group)))
+
+    return texts
+
+
+def parse_ocr_pages(ocr_texts: list[str]) -> StudentResult | None:
+    """
+    Builds one StudentResult from a student's page texts, in page order.
+    """
+    from parsing.header.ocr_header import extract_usn_and_name
+    from parsing.subjects.ocr_subjects import parse_vtu_table
 
-        # ocr_text = run_best_ocr_variant(
-        #     image_path=image_path,
-        #     variants=variants
-        # )
+    from aggregation.accumulator import ResultAccumulator
 
+    accumulator = ResultAccumulator()
+
+    for ocr_text in ocr_texts:
         # -----------------------------
         # HEADER (dict-based)
         # -----------------------------
-        # header = extract_usn_and_name(ocr_text)
+        header = extract_usn_and_name(ocr_text)
 
         # -----------------------------
-        # SUBJECTS (dict-based ✅)
+        # SUBJECTS (SubjectResult records ✅)
         # -----------------------------
-        # raw_subjects = parse_vtu_table(ocr_text)
-
-        subjects = []
-        # for s in raw_subjects:
-        #     subjects.append({
-        #     "subject_code": s.get("code"),   # 🔑 normalize key
-        #     "internal": s.get("internal"),
-        #     "external": s.get("external"),
-        #     "total": s.get("total"),
-        #     "result": s.get("result"),
-        # })
-
-
-        # subjects = [
-        #   { "code", "internal", "external", "total", "result" }
-        # ]
+        subjects = parse_vtu_table(ocr_text)
 
         # -----------------------------
         # ACCUMULATE PAGE
         # -----------------------------
-        # accumulator.process_page({
-        #     "usn": header.get("usn"),
-        #     "name": header.get("name"),
-        #     "subjects": subjects
-        # })
+        accumulator.process_page({
+            "usn": header.get("usn"),
+            "name": header.get("name"),
+            "subjects": subjects
+        })
 
     # -----------------------------
     # FINAL MERGE (multi-page)
     # -----------------------------
-    # results = accumulator.finalize()
+    results = accumulator.finalize()
+
+    return results[0] if results else None
+
+
+def parse_vtu_image(image_paths: list[str]) -> StudentResult | None:
+    """
+    Public OCR API:
+    Parses one or more VTU result images into one StudentResult.
+    """
+    ocr_texts = ocr_images(image_paths)
 
+    if any(text is None for text in ocr_texts):
+        raise ValueError("Failed to load one or more images")
 
-    # return results[0] if results else {}
+    return parse_ocr_pages(ocr_texts)
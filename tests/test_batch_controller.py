@@ -0,0 +1,39 @@
+import shutil
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+import batch.controller
+from batch.run_batch import run_pdf_batch
+from core.records import StudentResult, SubjectResult
+
+PDF_DIR = Path("batch/input/pdf/5th sem")
+TEMPLATE = Path("templates/5th Sem.xlsx")
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def test_folder_batch_survives_an_image_folder_without_marks(tmp_path, monkeypatch):
+    for pdf in sorted(PDF_DIR.glob("*.pdf"))[:2]:
+        shutil.copy(pdf, tmp_path / pdf.name)
+
+    photos = tmp_path / "photos"
+    photos.mkdir()
+    (photos / "page1.png").write_bytes(PNG_HEADER + b"\0" * 64)
+
+    # Stands in for the OCR stack (not installed here): a marks row
+    # that OCR'd badly, as parse_vtu_table returns it
+    def image_student_results(students):
+        assert [label for label, _, _ in students] == ["photos"]
+        return [StudentResult("4DM23AI999", "PHOTO STUDENT", [
+            SubjectResult("BCS501", result="P"),
+        ])]
+
+    monkeypatch.setattr(batch.controller, "image_student_results", image_student_results)
+    monkeypatch.setattr(batch.controller, "get_pdf_cache", lambda: None)
+
+    output = run_pdf_batch(tmp_path, TEMPLATE, tmp_path / "out.xlsx")
+
+    ws = load_workbook(output)["Student Result"]
+    usns = [ws.cell(row=row, column=2).value for row in range(6, 9)]
+    assert "4DM23AI999" in usns
+    assert all(usns)
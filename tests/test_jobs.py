@@ -0,0 +1,39 @@
+from batch.jobs import DONE, FAILED, QUEUED, JobStore
+
+
+def make_job(store, template="templates/5th Sem.xlsx"):
+    job_id, input_dir = store.create()
+    (input_dir / "001.pdf").write_bytes(b"%PDF-1.4")
+    store.submit(job_id, input_dir, template)
+    return job_id
+
+
+def test_purge_finished_removes_expired_jobs_and_folders(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+
+    done = make_job(store)
+    store.claim()
+    output = store.job_dir(done) / "VTU_Result.xlsx"
+    output.write_bytes(b"xlsx")
+    store.complete(done, output)
+
+    failed = make_job(store)
+    store.claim()
+    store.fail(failed, "boom")
+
+    queued = make_job(store)
+
+    # Still inside the retention window
+    assert store.purge_finished(max_age=3600) == 0
+    assert output.exists()
+    assert store.get(done)["status"] == DONE
+    assert store.get(failed)["status"] == FAILED
+
+    assert store.purge_finished(max_age=-1) == 2
+    assert store.get(done) is None
+    assert store.get(failed) is None
+    assert not store.job_dir(done).exists()
+
+    # Unfinished jobs are never purged
+    assert store.get(queued)["status"] == QUEUED
+    assert (store.job_dir(queued) / "input" / "001.pdf").exists()
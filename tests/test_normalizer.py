@@ -0,0 +1,61 @@
+import random
+import re
+import time
+
+import pytest
+
+from ingestion.pdf.normalizer import RESULT, SUBJECT_CODE, normalize_text
+
+
+def reference_normalize(text: str) -> str:
+    # The regex normalizer normalize_text replaced
+    text = text.replace("\u00a0", " ")
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(
+        rf"({SUBJECT_CODE})(.*?)\n?\s*(\d+)\s+(\d+)\s+(\d+)\s+({RESULT})",
+        r"\1 \3 \4 \5 \6",
+        text,
+        flags=re.DOTALL
+    )
+    return re.sub(r"\d{4}-\d{2}-\d{2}", "", text)
+
+
+TOKENS = [
+    "BCS501", "BCS5011", "BCSL504", "BRMK557", "ABCDEF123", "AB12", "BCS50",
+    "41", "27", "68", "1234", "12345", "0", "P", "F", "A", "X", "W", "PASS",
+    "SOFTWARE", "ENGINEERING", "x", ":", "-", ".", "2024-01-05", "2024-1-5",
+    " ", "  ", "\t", "\n", "\n\n", "\r\n", "\u00a0", "\x0b",
+]
+
+
+def test_matches_the_regex_normalizer_on_random_text():
+    rng = random.Random(0)
+
+    for _ in range(20000):
+        text = "".join(rng.choice(TOKENS) for _ in range(rng.randint(0, 40)))
+        assert normalize_text(text) == reference_normalize(text), repr(text)
+
+
+def best_time(text: str) -> float:
+    runs = []
+    for _ in range(3):
+        start = time.perf_counter()
+        normalize_text(text)
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+# Inputs that made the old DOTALL regex rescan the rest of the
+# document once per subject code
+@pytest.mark.parametrize("unit", [
+    "BCS501 SOFTWARE ENGINEERING 41 27\n",     # rows without marks
+    "BCS501 BCS502 BCS503 ",                   # codes only
+    "BCS501 41 27 68 \n",                      # marks missing result
+    "BCS5011 4127 68P\n",                      # digits without spaces
+])
+def test_scales_linearly_on_adversarial_input(unit):
+    # Doubling the input should about double the time; quadratic
+    # would quadruple it (the regex normalizer does ~4.3x here)
+    small = best_time(unit * 4000)
+    large = best_time(unit * 8000)
+    assert large / small < 3.0, f"{large / small:.2f}x for 2x input"
@@ -0,0 +1,27 @@
+import pytest
+
+from core.records import StudentResult
+from regex_engine.header_regex import extract_header
+from regex_engine.scanner import scan_result
+from regex_engine.subject_regex import extract_subjects
+
+HEADER = (
+    "VTU PROVISIONAL RESULTS OF UG / PG EXAMINATION.\n\n"
+    "University Seat Number : 4DM23AI001\n\n"
+    "Student Name : A M NAKEEB\n\n"
+    "Semester : 5\n\nSubject Code Subject Name Internal External Total\n\n"
+)
+ROWS = "".join(f"BCS5{i:02d} 41 27 68 P \n\nPROJECT MANAGEMENT\n\n" for i in range(10))
+FOOTER = "Nomenclature / Abbreviations\n\nP -> PASS F -> FAIL A -> ABSENT\n"
+
+
+@pytest.mark.parametrize("text", [
+    HEADER + ROWS + FOOTER,
+    ROWS + HEADER + FOOTER,                 # header last: worst case for the single pass
+    ROWS * 20,                              # no header
+    HEADER + HEADER.replace("001", "002") + ROWS,   # first occurrence wins
+    "",
+])
+def test_matches_the_multi_pass_extractors(text):
+    expected = StudentResult(**extract_header(text), subjects=extract_subjects(text))
+    assert scan_result(text) == expected
@@ -0,0 +1,73 @@
+import random
+import re
+
+from ingestion.image.scorer import OCRScorer
+
+
+def reference_score(text: str) -> int:
+    # The multi-pass scorer OCRScorer.score replaced
+    if not text or len(text.strip()) < 50:
+        return 0
+    t = text.upper()
+    score = 0
+    if "UNIVERSITY SEAT NUMBER" in t:
+        score += 15
+    if "STUDENT NAME" in t:
+        score += 12
+    if "SEMESTER" in t:
+        score += 8
+    if "VTU" in t or "VISVESVARAYA" in t:
+        score += 5
+    score += min(len(re.findall(r"\b[A-Z]{3,4}L?\d{3}\b", t)) * 4, 40)
+    score += min(len(re.findall(r"\b\d{1,3}\b", t)), 30)
+    if re.search(r"\bP\b", t):
+        score += 5
+    if "RESULT" in t:
+        score += 4
+    if re.search(r"\b20\d{2}[-/]\d{2}[-/]\d{2}\b", t):
+        score += 5
+    alnum_ratio = sum(c.isalnum() for c in text) / max(len(text), 1)
+    if alnum_ratio > 0.75:
+        score += 10
+    elif alnum_ratio > 0.65:
+        score += 5
+    else:
+        score -= 10
+    lines = [l for l in text.splitlines() if len(l.strip()) > 3]
+    if len(lines) > 25:
+        score += 10
+    elif len(lines) > 15:
+        score += 5
+    if re.search(r"[~^|<>]{3,}", text):
+        score -= 15
+    return max(score, 0)
+
+
+TOKENS = [
+    "University Seat Number", ": 4DM23AI028", "Student Name", "semester",
+    "VTU", "Visvesvaraya", "RESULT", "BCS401", "BCSL404", "bad402", "BCS4011",
+    "P", "p", "F", "2024-01-05", "x2024-01-05", "_2024/01/05", "2024/1/05",
+    "12", "100", "1000", "05", "_7", "~~~", "|||", "<>^",
+    # upper() changes length / \w and isalnum() disagree on these
+    "ß", "ﬁ", "²", "٣", "ͅ",
+    "_", "\t", "\r\n", "\n", "\x0b", " ", "-", ".",
+]
+
+
+def test_matches_the_multi_pass_scorer_on_random_text():
+    rng = random.Random(0)
+    scorer = OCRScorer()
+
+    for _ in range(30000):
+        text = "".join(
+            rng.choice(TOKENS) + rng.choice(("", " ", "\n", ":"))
+            for _ in range(rng.randint(0, 80))
+        )
+        assert scorer.score(text) == reference_score(text), repr(text)
+
+
+def test_score_many_keeps_order():
+    scorer = OCRScorer()
+    page = "VISVESVARAYA TECHNOLOGICAL UNIVERSITY\nStudent Name : X\n" + "BCS401 41 27 68 P\n" * 5
+
+    assert scorer.score_many([page, "", page]) == [scorer.score(page), 0, scorer.score(page)]
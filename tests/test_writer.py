@@ -0,0 +1,58 @@
+from openpyxl import load_workbook
+
+from core.records import StudentResult, SubjectResult
+from export.excel_batch import write_batch_results_excel
+from export.template_loader import load_template
+from export.writer import build_student_row, compile_write_plan
+from parsing.subjects.ocr_subjects import parse_vtu_table
+
+TEMPLATE = "templates/5th Sem.xlsx"
+
+
+def load_plan():
+    _, _, subject_column_map, total_col, percentage_col = load_template(TEMPLATE)
+    return compile_write_plan(subject_column_map, total_col, percentage_col), subject_column_map
+
+
+def test_ocr_row_without_marks_is_left_blank():
+    plan, columns = load_plan()
+
+    # No marks triplet in the first row: internal/external/total stay None
+    subjects = parse_vtu_table(
+        "BCS501 SOFTWARE ENG 5 P\n"
+        "BCS502 COMPUTER NETWORKS 40 45 85 P\n"
+    )
+    assert subjects[0].total is None
+
+    values, _, numeric_total = build_student_row(
+        plan, StudentResult("4DM23CS001", "OCR STUDENT", subjects), sl_no=1
+    )
+
+    bcs501 = columns["BCS501"]
+    assert values[bcs501["INTERNAL"] - 1] is None
+    assert values[bcs501["TOTAL"] - 1] is None
+    assert numeric_total == 85
+    assert values[plan["percentage_col"] - 1] == 85.0
+
+
+def test_batch_export_keeps_pdf_students_next_to_unreadable_ocr_rows(tmp_path):
+    _, columns = load_plan()
+
+    pdf_student = StudentResult("4DM23CS002", "PDF STUDENT", [
+        SubjectResult("BCS501", 40, 50, 90, "P"),
+        SubjectResult("BCS502", 35, 40, 75, "P"),
+    ])
+    ocr_student = StudentResult("4DM23CS001", "OCR STUDENT", [
+        SubjectResult("BCS501", result="P"),
+        SubjectResult("BCS502", 40, 45, 85, "P"),
+    ])
+
+    output = tmp_path / "out.xlsx"
+    write_batch_results_excel([pdf_student, ocr_student], TEMPLATE, str(output))
+
+    ws = load_workbook(output)["Student Result"]
+    assert ws.cell(row=6, column=2).value == "4DM23CS002"
+    assert ws.cell(row=6, column=columns["BCS501"]["TOTAL"]).value == 90
+    assert ws.cell(row=7, column=2).value == "4DM23CS001"
+    assert ws.cell(row=7, column=columns["BCS501"]["TOTAL"]).value is None
+    assert ws.cell(row=7, column=columns["BCS502"]["TOTAL"]).value == 85
@@ -0,0 +1,107 @@
+"""
+Import-time audit for API / batch workers.
+
+Imports an entry module in fresh interpreters (what a gunicorn worker
+pays on boot or recycle) and reports:
+  - cold import time (median of several runs)
+  - the slowest imports, from python -X importtime
+  - any heavy OCR modules that got pulled in
+
+PDF-only entry points must not load torch, doctr or cv2; those belong
+to the image path and are imported on first use.
+
+    python -m utils.import_audit              # audits api.app
+    python -m utils.import_audit batch.worker --runs 10
+
+Exits non-zero if a forbidden module was imported.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+FORBIDDEN = ("torch", "doctr", "cv2")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def cold_import(module: str) -> tuple[float, list[str]]:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, forbidden=FORBIDDEN)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    loaded = out[1].split(",") if len(out) > 1 else []
+    return float(out[0]), loaded
+
+
+def slowest_imports(module: str, top: int = 10) -> list[tuple[int, str]]:
+    """
+    [(cumulative microseconds, module name)] for the top-level
+    imports that cost the most.
+    """
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    timings = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        # One level of nesting below the entry module
+        if name.startswith("   ") and not name.startswith("     "):
+            timings.append((int(cumulative), name.strip()))
+
+    return sorted(timings, reverse=True)[:top]
+
+
+def audit(module: str, runs: int = 5) -> bool:
+    times = []
+    loaded = []
+    for _ in range(runs):
+        elapsed, loaded = cold_import(module)
+        times.append(elapsed)
+
+    print(f"import {module}: median {statistics.median(times) * 1000:.0f} ms "
+          f"(min {min(times) * 1000:.0f}, max {max(times) * 1000:.0f}, {runs} runs)")
+
+    print("slowest direct imports:")
+    for cumulative, name in slowest_imports(module):
+        print(f"  {cumulative / 1000:7.1f} ms  {name}")
+
+    if loaded:
+        print(f"❌ heavy OCR modules imported: {', '.join(loaded)}")
+        return False
+
+    print(f"✅ none of {', '.join(FORBIDDEN)} imported")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("module", nargs="?", default="api.app")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(0 if audit(args.module, args.runs) else 1)
@@ -0,0 +1,71 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+
+class TempJanitor:
+    """
+    Background sweeper for a temp directory.
+
+    Removes any entry (file or folder) older than max_age seconds,
+    so request handlers never pay for cleanup themselves and
+    leftovers from crashed requests don't pile up.
+    """
+
+    def __init__(self, root: Path, max_age: float, interval: float = 300):
+        self.root = Path(root)
+        self.max_age = max_age
+        self.interval = interval
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        """
+        Idempotent; restarts the thread in forked workers
+        (threads don't survive fork).
+        """
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="temp-janitor",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.sweep()
+            time.sleep(self.interval)
+
+    def sweep(self) -> int:
+        removed = 0
+        cutoff = time.time() - self.max_age
+
+        try:
+            entries = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return 0
+
+        for entry in entries:
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                    continue
+
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.remove(entry.path)
+                removed += 1
+
+            except OSError:
+                # In use or already gone
+                continue
+
+        return removed
@@ -0,0 +1,58 @@
+"""
+Timings for the OCR hot spots that run once per candidate text.
+
+    python -m utils.ocr_bench
+
+  - best_marks_triplet on noisy candidate lists, including lists
+    whose marks never add up (every pair is tried)
+  - OCRScorer.score_many on a full result page, ASCII and not
+
+Equivalence with the implementations these replaced is checked in
+tests/ (python -m pytest).
+"""
+
+import random
+import time
+
+from ingestion.image.scorer import OCRScorer
+from parsing.subjects.ocr_subjects import best_marks_triplet
+
+
+def per_call_ms(func, *args, runs: int = 10) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        func(*args)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def bench_triplet(rng: random.Random):
+    for size in (10, 20, 30, 60):
+        for label, numbers in (
+            ("noisy", [rng.randint(10, 100) for _ in range(size)]),
+            ("no fit", [rng.randint(60, 100) for _ in range(size)]),
+        ):
+            elapsed = per_call_ms(best_marks_triplet, numbers, "F")
+            print(f"triplet {size:>3} numbers {label:<7}: {elapsed:6.2f} ms")
+
+
+def bench_scorer():
+    row = "BCS40{} SOFTWARE ENGINEERING 41 27 68 P 2025-01-0{}\n"
+    page = (
+        "VISVESVARAYA TECHNOLOGICAL UNIVERSITY\nUniversity Seat Number : 4DM23AI028\n"
+        "Student Name : MOHAMMAD ASHIN\nSemester : 4\n"
+        + "".join(row.format(i, i) for i in range(1, 10))
+    )
+    scorer = OCRScorer()
+
+    for label, text in (
+        ("ascii page", page),
+        ("non-ascii page", page + "\u0cb5\u0cbf.\u0ca4\u0cbe.\u0cb5\u0cbf"),
+    ):
+        texts = [text] * 200
+        elapsed = per_call_ms(scorer.score_many, texts)
+        print(f"scorer  {label:<15}: {elapsed * 1000 / len(texts):6.1f} us/text")
+
+
+if __name__ == "__main__":
+    bench_triplet(random.Random(0))
+    bench_scorer()
@@ -0,0 +1,48 @@
+"""
+Micro-benchmark: single-pass scan_result against the multi-pass
+extract_header() + extract_subjects() it replaced.
+
+    python -m utils.scanner_bench [runs]
+
+Equivalence is checked in tests/test_scanner.py.
+"""
+
+import sys
+import time
+
+from regex_engine.header_regex import extract_header
+from regex_engine.scanner import scan_result
+from regex_engine.subject_regex import extract_subjects
+
+HEADER = (
+    "VTU PROVISIONAL RESULTS OF UG / PG EXAMINATION.\n\n"
+    "University Seat Number : 4DM23AI001\n\n"
+    "Student Name : A M NAKEEB\n\n"
+    "Semester : 5\n\nSubject Code Subject Name Internal External Total\n\n"
+)
+ROWS = "".join(f"BCS5{i:02d} 41 27 68 P \n\nPROJECT MANAGEMENT\n\n" for i in range(10))
+FOOTER = "Nomenclature / Abbreviations\n\nP -> PASS F -> FAIL A -> ABSENT\n"
+
+# Header last exercises the worst case for the single pass
+SAMPLES = {
+    "typical": HEADER + ROWS + FOOTER,
+    "header last": ROWS + HEADER + FOOTER,
+    "no header": ROWS * 20,
+}
+
+
+def per_call_us(func, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{'text':<12}{'chars':>8}{'multi-pass us':>16}{'single-pass us':>16}")
+    for label, text in SAMPLES.items():
+        multi = per_call_us(lambda: (extract_header(text), extract_subjects(text)), runs)
+        single = per_call_us(lambda: scan_result(text), runs)
+        print(f"{label:<12}{len(text):>8}{multi:>16.1f}{single:>16.1f}")
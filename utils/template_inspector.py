@@ -1,61 +1,233 @@
+"""
+Template layout compiler.
+
+Discovers where each subject, activity slot, grand total and
+percentage lives in a semester template and stores it as a
+JSON manifest next to the .xlsx ("5th Sem.xlsx" -> "5th Sem.layout.json").
+
+export/template_loader.py reads the manifest instead of walking
+the header rows; it is rebuilt automatically when the template's
+content hash changes.
+
+Run directly to (re)compile every template:
+    python -m utils.template_inspector
+"""
+
+import hashlib
+import json
+import re
 from pathlib import Path
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 
 
 HEADER_ROWS = (4, 5)  # merged header spans these rows
+SUBJECT_CODE_PATTERN = re.compile(r"^[A-Z]{3,5}\d{3,4}[A-Z]?$")
+MANIFEST_VERSION = 1
+
+
+def is_activity_header(text: str) -> bool:
+    if "/" not in text:
+        return False
+    parts = [p.strip() for p in text.split("/")]
+    return (
+        len(parts) == 2
+        and all(SUBJECT_CODE_PATTERN.match(p) and p[-1] == "9" for p in parts)
+    )
 
 
-def get_cell_text(ws, row, col):
+def select_sheet(wb):
+    if "Student Result" in wb.sheetnames:
+        return wb["Student Result"]
+    if "Student Results" in wb.sheetnames:
+        return wb["Student Results"]
+    return wb.worksheets[0]
+
+
+# -----------------------
+# Merged cells
+# -----------------------
+
+def build_merged_index(ws) -> dict:
+    """
+    Maps every (row, col) covered by a merged range to the
+    (row, col) of its top-left cell. Built once per sheet,
+    so each lookup is O(1) instead of a scan over all ranges.
+    """
+    index = {}
+    for merged in ws.merged_cells.ranges:
+        anchor = (merged.min_row, merged.min_col)
+        for row in range(merged.min_row, merged.max_row + 1):
+            for col in range(merged.min_col, merged.max_col + 1):
+                index[(row, col)] = anchor
+    return index
+
+
+def get_cell_text(ws, row, col, merged_index=None):
     """
     Safely get text from merged or normal cells.
     """
-    cell = ws.cell(row=row, column=col)
+    if merged_index is None:
+        merged_index = build_merged_index(ws)
 
     # If part of merged cell, read from top-left
-    if cell.coordinate in ws.merged_cells:
-        for merged in ws.merged_cells.ranges:
-            if cell.coordinate in merged:
-                return ws.cell(
-                    row=merged.min_row,
-                    column=merged.min_col
-                ).value
-    return cell.value
+    row, col = merged_index.get((row, col), (row, col))
+    return ws.cell(row=row, column=col).value
+
+
+# -----------------------
+# Layout discovery
+# -----------------------
+
+def find_subject_columns(ws, merged_index=None) -> dict:
+    if merged_index is None:
+        merged_index = build_merged_index(ws)
+
+    subject_column_map = {}
+    col = 1
+    max_col = ws.max_column
+
+    while col <= max_col:
+        header_value = None
 
+        for r in HEADER_ROWS:
+            val = get_cell_text(ws, r, col, merged_index)
+            if isinstance(val, str):
+                header_value = val.strip()
+                break
 
-def find_columns(ws):
-    total_candidates = []
-    percentage_candidates = []
+        if header_value and (
+            is_activity_header(header_value)
+            or SUBJECT_CODE_PATTERN.match(header_value)
+        ):
+            subject_column_map[header_value] = {
+                "INTERNAL": col,
+                "EXTERNAL": col + 1,
+                "TOTAL": col + 2,
+            }
+            col += 3
+            continue
 
-    for col in range(1, ws.max_column + 1):
-        texts = []
+        col += 1
 
-        for row in HEADER_ROWS:
-            value = get_cell_text(ws, row, col)
-            if value:
-                texts.append(str(value).lower())
+    return subject_column_map
 
-        combined_text = " ".join(texts)
 
-        if "total" in combined_text:
-            total_candidates.append(col)
+def find_total_and_percentage_columns(ws):
+    total_col = None
+    percentage_col = None
 
-        if "percentage" in combined_text or "%" in combined_text:
-            percentage_candidates.append(col)
+    for merged in ws.merged_cells.ranges:
+        # Only care about header rows
+        if merged.min_row not in HEADER_ROWS:
+            continue
 
-    total_col = max(total_candidates) if total_candidates else None
-    percentage_col = max(percentage_candidates) if percentage_candidates else None
+        header_cell = ws.cell(row=merged.min_row, column=merged.min_col)
+        if not header_cell.value:
+            continue
+
+        text = str(header_cell.value).lower()
+
+        # VTU puts numeric data at the END of merged header
+        data_col = merged.max_col
+
+        if "total" in text:
+            total_col = data_col
+
+        if "percentage" in text or "%" in text:
+            percentage_col = data_col
 
     return total_col, percentage_col
 
+
+def compile_layout(ws) -> dict:
+    merged_index = build_merged_index(ws)
+    subject_column_map = find_subject_columns(ws, merged_index)
+    total_col, percentage_col = find_total_and_percentage_columns(ws)
+
+    return {
+        "sheet": ws.title,
+        "subject_columns": subject_column_map,
+        "activity_slots": [k for k in subject_column_map if "/" in k],
+        "total_col": total_col,
+        "percentage_col": percentage_col,
+    }
+
+
+# -----------------------
+# Manifest files
+# -----------------------
+
+def manifest_path(template_path) -> Path:
+    template_path = Path(template_path)
+    return template_path.with_name(f"{template_path.stem}.layout.json")
+
+
+def template_hash(template_path) -> str:
+    return hashlib.sha256(Path(template_path).read_bytes()).hexdigest()
+
+
+def load_manifest(template_path, source_hash: str | None = None) -> dict | None:
+    """
+    Returns the stored manifest, or None if it is missing,
+    unreadable or was compiled from a different template.
+    """
+    try:
+        manifest = json.loads(manifest_path(template_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if source_hash is None:
+        source_hash = template_hash(template_path)
+
+    if (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("source_sha256") != source_hash
+    ):
+        return None
+
+    return manifest
+
+
+def compile_template(template_path, ws=None, source_hash: str | None = None) -> dict:
+    """
+    Compiles and writes the manifest for one template.
+    Pass ws if the workbook is already loaded.
+    """
+    if ws is None:
+        ws = select_sheet(load_workbook(template_path))
+
+    if source_hash is None:
+        source_hash = template_hash(template_path)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source_sha256": source_hash,
+        **compile_layout(ws),
+    }
+
+    try:
+        manifest_path(template_path).write_text(
+            json.dumps(manifest, indent=2),
+            encoding="utf-8"
+        )
+    except OSError:
+        # Read-only deploy: still usable, just recompiled next process
+        pass
+
+    return manifest
+
+
 def inspect_templates(template_dir: Path):
-    for template in template_dir.glob("*.xlsx"):
-        wb = load_workbook(template)
-        ws = wb.active  # or explicit sheet if you want
+    for template in sorted(template_dir.glob("*.xlsx")):
+        manifest = compile_template(template)
 
-        total_col, percentage_col = find_columns(ws)
+        total_col = manifest["total_col"]
+        percentage_col = manifest["percentage_col"]
 
         print(f"\nTemplate: {template.name}")
+        print(f"  Subjects        : {len(manifest['subject_columns'])}")
+        print(f"  Activity slots  : {', '.join(manifest['activity_slots']) or 'NONE'}")
 
         if total_col:
             print(f"  Grand Total     : {get_column_letter(total_col)} ({total_col})")
@@ -69,5 +241,5 @@ def inspect_templates(template_dir: Path):
 
 
 if __name__ == "__main__":
-    TEMPLATE_DIR = Path("backend/templates")
-    inspect_templates(TEMPLATE_DIR)
+    from config import TEMPLATES_DIR
+    inspect_templates(Path(TEMPLATES_DIR))